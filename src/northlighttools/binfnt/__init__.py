@@ -1,14 +1,76 @@
+import json
+import tempfile
+import time
+from dataclasses import asdict
 from pathlib import Path
 
 import typer
+from rich import print
+from rich.console import Console
 from rich.progress import Progress, SpinnerColumn, TextColumn
+from rich.table import Table
 
+from northlighttools.binfnt.batch import (
+    compile_font,
+    decompile_font,
+    print_batch_summary,
+    run_batch,
+)
+from northlighttools.binfnt.benchmark import print_benchmark_summary, run_benchmark
+from northlighttools.binfnt.bmfont import BMFont
+from northlighttools.binfnt.cache import BuildCache
+from northlighttools.binfnt.enumerators.character_set import CharacterSet
+from northlighttools.binfnt.enumerators.font_format import FontFormat
+from northlighttools.binfnt.enumerators.font_version import FontVersion
 from northlighttools.binfnt.font import BinaryFont
+from northlighttools.binfnt.helpers import get_baseline_codepoints, get_used_codepoints
 from northlighttools.rmdp import Annotated
 
 app = typer.Typer(help="Tools for .binfnt files (Binary font files)")
 
 
+@app.command(name="info", help="Show information about binary font(s)")
+def cmd_info(
+    input_files: Annotated[
+        list[Path],
+        typer.Argument(
+            help="Input .binfnt file path(s)",
+            exists=True,
+            readable=True,
+            file_okay=True,
+            dir_okay=False,
+        ),
+    ],
+):
+    table = Table(
+        "File",
+        "Version",
+        "Characters",
+        "Kernings",
+        "Texture",
+        "Line height",
+        "Font size",
+    )
+
+    # Only metadata is read (texture is never decoded), so skip per-step logs
+    with Progress(console=Console(quiet=True)) as progress:
+        for input_file in input_files:
+            binfnt = BinaryFont(progress, input_file)
+            texture_width, texture_height = binfnt.texture_dimensions
+
+            table.add_row(
+                str(input_file),
+                f"{binfnt.version.name.replace('_', ' ').title()} ({binfnt.version.value})",
+                str(binfnt.character_count),
+                str(binfnt.kerning_count),
+                f"{texture_width}x{texture_height}",
+                f"{binfnt.line_height:g}",
+                f"{binfnt.font_size:g}",
+            )
+
+    Console().print(table)
+
+
 @app.command(
     name="decompile", help="Decompile binary font to editable metadata and bitmap(s)"
 )
@@ -38,6 +100,24 @@ def cmd_decompile(
             is_flag=True,
         ),
     ] = False,
+    font_format: Annotated[
+        FontFormat,
+        typer.Option(
+            "--format",
+            "-f",
+            help="Output format, npz stores raw font tables and texture for fast round-trips",
+            case_sensitive=False,
+        ),
+    ] = FontFormat.XML,
+    compress: Annotated[
+        bool,
+        typer.Option(
+            "--compress",
+            "-c",
+            help="Compress npz output",
+            is_flag=True,
+        ),
+    ] = False,
 ):
     output_dir = output_dir or input_file.parent / input_file.stem
     output_dir.mkdir(parents=True, exist_ok=True)
@@ -49,7 +129,7 @@ def cmd_decompile(
         task = progress.add_task("Decompiling...", total=1)
 
         binfnt = BinaryFont(progress, input_file)
-        binfnt.decompile(output_dir, separate_chars)
+        binfnt.decompile(output_dir, separate_chars, font_format, compress)
 
         progress.update(task, advance=1, description="Decompiled successfully")
 
@@ -59,7 +139,7 @@ def cmd_compile(
     input_file: Annotated[
         Path,
         typer.Argument(
-            help="Input metadata file path",
+            help="Input metadata (.xml, .npz or BMFont .fnt) file path",
             exists=True,
             readable=True,
             file_okay=True,
@@ -75,7 +155,60 @@ def cmd_compile(
             dir_okay=False,
         ),
     ] = None,
+    repack: Annotated[
+        bool,
+        typer.Option(
+            "--repack",
+            help="Rebuild texture atlas from character bitmaps into the smallest power-of-two texture",
+            is_flag=True,
+        ),
+    ] = False,
+    padding: Annotated[
+        int,
+        typer.Option(
+            "--padding",
+            help="Empty pixels between repacked characters",
+            min=0,
+        ),
+    ] = 1,
+    cache_dir: Annotated[
+        Path | None,
+        typer.Option(
+            "--cache-dir",
+            help="Directory for build cache, unchanged parts of previous build are reused",
+            file_okay=False,
+            dir_okay=True,
+        ),
+    ] = None,
+    from_bmfont: Annotated[
+        bool,
+        typer.Option(
+            "--from-bmfont",
+            help="Input is AngelCode BMFont descriptor (.fnt), its pages are merged into single atlas",
+            is_flag=True,
+        ),
+    ] = False,
+    font_version: Annotated[
+        int,
+        typer.Option(
+            "--font-version",
+            help="Version of compiled font (only for --from-bmfont)",
+        ),
+    ] = FontVersion.QUANTUM_BREAK.value,
 ):
+    if input_file.suffix.lower() == ".npz" and (repack or cache_dir):
+        raise typer.BadParameter(
+            "--repack and --cache-dir are only supported for .xml metadata files."
+        )
+
+    if from_bmfont and cache_dir:
+        raise typer.BadParameter("--cache-dir is not supported with --from-bmfont.")
+
+    try:
+        version = FontVersion(font_version)
+    except ValueError as e:
+        raise typer.BadParameter(str(e))
+
     output_file = output_file or input_file.with_suffix(".binfnt")
     output_file.parent.mkdir(parents=True, exist_ok=True)
 
@@ -87,11 +220,480 @@ def cmd_compile(
     ) as progress:
         task = progress.add_task("Compiling...", total=1)
 
+        if from_bmfont:
+            binfnt = BinaryFont(progress)
+            binfnt.compile_bmfont(input_file, version, repack, padding)
+            binfnt.save(output_file)
+        elif input_file.suffix.lower() == ".npz":
+            # Tables and texture are stored ready to be written
+            binfnt = BinaryFont(progress, input_file)
+            binfnt.save(output_file)
+        elif cache_dir:
+            BuildCache(progress, cache_dir).build(
+                input_file, output_file, separate_chars, repack, padding
+            )
+        else:
+            binfnt = BinaryFont(progress)
+            binfnt.compile(input_file, separate_chars, repack, padding)
+            binfnt.save(output_file)
+
+        progress.update(task, advance=1, description="Compiled successfully")
+
+
+@app.command(
+    name="decompile-all",
+    help="Decompile all binary fonts in directory (in parallel)",
+)
+def cmd_decompile_all(
+    input_dir: Annotated[
+        Path,
+        typer.Argument(
+            help="Directory with .binfnt files (searched recursively)",
+            exists=True,
+            readable=True,
+            file_okay=False,
+            dir_okay=True,
+        ),
+    ],
+    output_dir: Annotated[
+        Path | None,
+        typer.Argument(
+            help="Output directory (default: input directory)",
+            writable=True,
+            file_okay=False,
+            dir_okay=True,
+        ),
+    ] = None,
+    separate_chars: Annotated[
+        bool,
+        typer.Option(
+            "--separate-chars",
+            "-s",
+            help="Save each character bitmap to a separate file",
+            is_flag=True,
+        ),
+    ] = False,
+    font_format: Annotated[
+        FontFormat,
+        typer.Option(
+            "--format",
+            "-f",
+            help="Output format, npz stores raw font tables and texture for fast round-trips",
+            case_sensitive=False,
+        ),
+    ] = FontFormat.XML,
+    compress: Annotated[
+        bool,
+        typer.Option(
+            "--compress",
+            "-c",
+            help="Compress npz output",
+            is_flag=True,
+        ),
+    ] = False,
+    jobs: Annotated[
+        int | None,
+        typer.Option(
+            "--jobs",
+            "-j",
+            min=1,
+            help="Number of worker processes (default: number of CPUs)",
+        ),
+    ] = None,
+):
+    output_dir = output_dir or input_dir
+
+    # Same layout as decompile, every font gets a directory named after it
+    batch = [
+        (
+            input_file,
+            output_dir / input_file.relative_to(input_dir).parent / input_file.stem,
+            (separate_chars, font_format, compress),
+        )
+        for input_file in sorted(input_dir.rglob("*.binfnt"))
+    ]
+
+    if not batch:
+        raise typer.BadParameter(f"No .binfnt files found in {input_dir}")
+
+    start = time.perf_counter()
+    results = run_batch(decompile_font, batch, "Decompiling fonts...", jobs)
+    print_batch_summary(results, time.perf_counter() - start)
+
+    if any(result.error is not None for result in results):
+        raise typer.Exit(code=1)
+
+
+@app.command(
+    name="compile-all",
+    help="Compile all font metadata files in directory (in parallel)",
+)
+def cmd_compile_all(
+    input_dir: Annotated[
+        Path,
+        typer.Argument(
+            help="Directory with metadata .xml/.npz files (searched recursively)",
+            exists=True,
+            readable=True,
+            file_okay=False,
+            dir_okay=True,
+        ),
+    ],
+    output_dir: Annotated[
+        Path | None,
+        typer.Argument(
+            help="Output directory (default: input directory)",
+            writable=True,
+            file_okay=False,
+            dir_okay=True,
+        ),
+    ] = None,
+    repack: Annotated[
+        bool,
+        typer.Option(
+            "--repack",
+            help="Rebuild texture atlas from character bitmaps into the smallest power-of-two texture",
+            is_flag=True,
+        ),
+    ] = False,
+    padding: Annotated[
+        int,
+        typer.Option(
+            "--padding",
+            help="Empty pixels between repacked characters",
+            min=0,
+        ),
+    ] = 1,
+    cache_dir: Annotated[
+        Path | None,
+        typer.Option(
+            "--cache-dir",
+            help="Directory for build cache, unchanged parts of previous build are reused",
+            file_okay=False,
+            dir_okay=True,
+        ),
+    ] = None,
+    jobs: Annotated[
+        int | None,
+        typer.Option(
+            "--jobs",
+            "-j",
+            min=1,
+            help="Number of worker processes (default: number of CPUs)",
+        ),
+    ] = None,
+):
+    output_dir = output_dir or input_dir
+
+    batch = [
+        (
+            input_file,
+            output_dir / input_file.relative_to(input_dir).with_suffix(".binfnt"),
+            (repack, padding, cache_dir),
+        )
+        for input_file in sorted(
+            path for pattern in ("*.xml", "*.npz") for path in input_dir.rglob(pattern)
+        )
+    ]
+
+    if not batch:
+        raise typer.BadParameter(f"No metadata files found in {input_dir}")
+
+    start = time.perf_counter()
+    results = run_batch(compile_font, batch, "Compiling fonts...", jobs)
+    print_batch_summary(results, time.perf_counter() - start)
+
+    if any(result.error is not None for result in results):
+        raise typer.Exit(code=1)
+
+
+@app.command(
+    name="subset",
+    help="Compile binary font with only characters used by string table(s)",
+)
+def cmd_subset(
+    input_file: Annotated[
+        Path,
+        typer.Argument(
+            help="Input metadata file path",
+            exists=True,
+            readable=True,
+            file_okay=True,
+            dir_okay=False,
+        ),
+    ],
+    output_file: Annotated[
+        Path | None,
+        typer.Argument(
+            help="Output .binfnt file path",
+            writable=True,
+            file_okay=True,
+            dir_okay=False,
+        ),
+    ] = None,
+    string_tables: Annotated[
+        list[Path] | None,
+        typer.Option(
+            "--strings",
+            "-S",
+            help="string_table.bin file with texts that will be rendered with the font (can be repeated)",
+            exists=True,
+            readable=True,
+            file_okay=True,
+            dir_okay=False,
+        ),
+    ] = None,
+    baseline: Annotated[
+        CharacterSet,
+        typer.Option(
+            "--baseline",
+            "-b",
+            help="Characters that are always kept",
+            case_sensitive=False,
+        ),
+    ] = CharacterSet.ASCII,
+    keep: Annotated[
+        str,
+        typer.Option("--keep", "-k", help="Additional characters to always keep"),
+    ] = "",
+    padding: Annotated[
+        int,
+        typer.Option(
+            "--padding",
+            help="Empty pixels between repacked characters",
+            min=0,
+        ),
+    ] = 1,
+):
+    if not string_tables:
+        raise typer.BadParameter("At least one string table has to be provided.")
+
+    output_file = output_file or input_file.with_name(
+        f"{input_file.stem}_subset.binfnt"
+    )
+    output_file.parent.mkdir(parents=True, exist_ok=True)
+
+    separate_chars = not input_file.with_suffix(".png").exists()
+
+    with Progress(
+        SpinnerColumn(finished_text=":white_check_mark:"),
+        TextColumn("[progress.description]{task.description}"),
+    ) as progress:
+        task = progress.add_task("Subsetting...", total=1)
+
+        codepoints = get_used_codepoints(string_tables)
+        codepoints |= get_baseline_codepoints(baseline)
+        codepoints.update(map(ord, keep))
+
         binfnt = BinaryFont(progress)
-        binfnt.compile(input_file, separate_chars)
+        binfnt.compile(
+            input_file,
+            separate_chars,
+            repack=True,
+            padding=padding,
+            codepoints=codepoints,
+        )
         binfnt.save(output_file)
 
-        progress.update(task, advance=1, description="Compiled successfully")
+        progress.update(task, advance=1, description="Subsetted successfully")
+
+
+@app.command(name="kerning", help="Look up, clean up or merge kerning of binary font")
+def cmd_kerning(
+    input_file: Annotated[
+        Path,
+        typer.Argument(
+            help="Input .binfnt file path",
+            exists=True,
+            readable=True,
+            file_okay=True,
+            dir_okay=False,
+        ),
+    ],
+    output_file: Annotated[
+        Path | None,
+        typer.Argument(
+            help="Output .binfnt file path (default: overwrite input file)",
+            writable=True,
+            file_okay=True,
+            dir_okay=False,
+        ),
+    ] = None,
+    pairs: Annotated[
+        list[str] | None,
+        typer.Option(
+            "--pair",
+            "-p",
+            help="Two characters to show kerning amount of (can be repeated)",
+        ),
+    ] = None,
+    merge: Annotated[
+        Path | None,
+        typer.Option(
+            "--merge",
+            "-m",
+            help="BMFont .fnt file (text, XML or binary) to merge kerning pairs from",
+            exists=True,
+            readable=True,
+            file_okay=True,
+            dir_okay=False,
+        ),
+    ] = None,
+    dedup: Annotated[
+        bool,
+        typer.Option(
+            "--dedup",
+            help="Remove repeated pairs (first occurrence is kept)",
+            is_flag=True,
+        ),
+    ] = False,
+    prune: Annotated[
+        bool,
+        typer.Option(
+            "--prune",
+            help="Remove zero amount pairs and pairs of characters missing in font",
+            is_flag=True,
+        ),
+    ] = False,
+):
+    for pair in pairs or []:
+        if len(pair) != 2:
+            raise typer.BadParameter(f"Kerning pair must be two characters: {pair}")
+
+    with Progress(console=Console(quiet=True)) as progress:
+        binfnt = BinaryFont(progress, input_file)
+
+    print(f"Kerning pairs: {binfnt.kerning_count}")
+
+    for pair in pairs or []:
+        amount = binfnt.get_kerning(ord(pair[0]), ord(pair[1]))
+        print(f"{pair}: {'no kerning' if amount is None else f'{amount:g}'}")
+
+    if not (merge or dedup or prune):
+        return
+
+    if merge:
+        replaced, added = binfnt.merge_kernings(BMFont(merge).kernings)
+        print(f"Merged {merge.name}: {replaced} pair(s) replaced, {added} added")
+
+    if dedup:
+        print(f"Removed {binfnt.deduplicate_kernings()} repeated pair(s)")
+
+    if prune:
+        print(f"Removed {binfnt.prune_kernings()} zero or orphan pair(s)")
+
+    binfnt.sort_kernings()
+    binfnt.save(output_file or input_file)
+
+    print(
+        f"Saved {binfnt.kerning_count} kerning pair(s) to {output_file or input_file}"
+    )
+
+
+@app.command(
+    name="benchmark",
+    help="Benchmark decompile/compile round-trip of synthetic fonts",
+)
+def cmd_benchmark(
+    versions: Annotated[
+        list[int] | None,
+        typer.Option(
+            "--version",
+            "-v",
+            help="Font version(s) to benchmark (default: all)",
+        ),
+    ] = None,
+    glyphs: Annotated[
+        int,
+        typer.Option("--glyphs", "-g", help="Number of characters", min=1),
+    ] = 2000,
+    atlas_size: Annotated[
+        int,
+        typer.Option("--atlas-size", "-a", help="Texture width and height", min=2),
+    ] = 2048,
+    kernings: Annotated[
+        int,
+        typer.Option("--kernings", "-k", help="Number of kerning pairs", min=0),
+    ] = 5000,
+    separate_chars: Annotated[
+        bool,
+        typer.Option(
+            "--separate-chars",
+            "-s",
+            help="Round-trip through separate character bitmap files",
+            is_flag=True,
+        ),
+    ] = False,
+    seed: Annotated[
+        int,
+        typer.Option("--seed", help="Seed of synthetic font generator"),
+    ] = 0,
+    work_dir: Annotated[
+        Path | None,
+        typer.Option(
+            "--work-dir",
+            help="Keep generated and round-tripped files in this directory",
+            file_okay=False,
+            dir_okay=True,
+        ),
+    ] = None,
+    output_file: Annotated[
+        Path | None,
+        typer.Option(
+            "--output",
+            "-o",
+            help="Save results to JSON file",
+            file_okay=True,
+            dir_okay=False,
+        ),
+    ] = None,
+):
+    try:
+        font_versions = [FontVersion(version) for version in versions or FontVersion]
+    except ValueError as e:
+        raise typer.BadParameter(str(e))
+
+    results = []
+
+    with (
+        tempfile.TemporaryDirectory() as temp_dir,
+        Progress(
+            SpinnerColumn(finished_text=":white_check_mark:"),
+            TextColumn("[progress.description]{task.description}"),
+            transient=True,
+        ) as progress,
+    ):
+        task = progress.add_task("Benchmarking...", total=len(font_versions))
+
+        for font_version in font_versions:
+            progress.update(task, description=f"Benchmarking {font_version.name}...")
+
+            try:
+                results.append(
+                    run_benchmark(
+                        work_dir or Path(temp_dir),
+                        font_version,
+                        glyphs,
+                        atlas_size,
+                        kernings,
+                        separate_chars,
+                        seed,
+                    )
+                )
+            except ValueError as e:
+                # Synthetic font could not be generated for given parameters
+                raise typer.BadParameter(str(e))
+
+            progress.advance(task)
+
+    print_benchmark_summary(results)
+
+    if output_file:
+        with output_file.open("w", encoding="utf-8") as f:
+            json.dump([asdict(result) for result in results], f, indent=2)
+
+    if any(result.error is not None for result in results):
+        raise typer.Exit(code=1)
 
 
 if __name__ == "__main__":
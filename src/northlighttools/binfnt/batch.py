@@ -0,0 +1,147 @@
+import time
+from collections.abc import Callable
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+
+from rich.console import Console
+from rich.markup import escape
+from rich.progress import (
+    BarColumn,
+    MofNCompleteColumn,
+    Progress,
+    SpinnerColumn,
+    TaskProgressColumn,
+    TextColumn,
+    TimeElapsedColumn,
+    TimeRemainingColumn,
+)
+from rich.table import Table
+
+from northlighttools.binfnt.cache import BuildCache
+from northlighttools.binfnt.dataclasses.batch_result import BatchResult
+from northlighttools.binfnt.enumerators.font_format import FontFormat
+from northlighttools.binfnt.font import BinaryFont
+
+
+def decompile_font(
+    input_file: Path,
+    output_dir: Path,
+    separate_chars: bool,
+    font_format: FontFormat = FontFormat.XML,
+    compress: bool = False,
+) -> float:
+    # Runs in worker processes, per-step logs of BinaryFont are not shown
+    start = time.perf_counter()
+
+    with Progress(console=Console(quiet=True), disable=True) as progress:
+        # Fonts which fail to load don't leave empty directories behind
+        binfnt = BinaryFont(progress, input_file)
+
+        output_dir.mkdir(parents=True, exist_ok=True)
+        binfnt.decompile(output_dir, separate_chars, font_format, compress)
+
+    return time.perf_counter() - start
+
+
+def compile_font(
+    input_file: Path,
+    output_file: Path,
+    repack: bool,
+    padding: int,
+    cache_dir: Path | None = None,
+) -> float:
+    start = time.perf_counter()
+    separate_chars = not input_file.with_suffix(".png").exists()
+
+    with Progress(console=Console(quiet=True), disable=True) as progress:
+        output_file.parent.mkdir(parents=True, exist_ok=True)
+
+        if input_file.suffix.lower() == ".npz":
+            # Tables and texture are stored ready to be written
+            binfnt = BinaryFont(progress, input_file)
+            binfnt.save(output_file)
+        elif cache_dir:
+            BuildCache(progress, cache_dir).build(
+                input_file, output_file, separate_chars, repack, padding
+            )
+        else:
+            binfnt = BinaryFont(progress)
+            binfnt.compile(input_file, separate_chars, repack, padding)
+            binfnt.save(output_file)
+
+    return time.perf_counter() - start
+
+
+def run_batch(
+    worker: Callable[..., float],
+    jobs: list[tuple[Path, Path, tuple]],
+    description: str,
+    max_workers: int | None = None,
+) -> list[BatchResult]:
+    # Every job is (input path, output path, extra worker arguments),
+    # failed fonts are reported and the rest of the batch keeps going
+    results = []
+
+    with (
+        Progress(
+            SpinnerColumn(finished_text=":white_check_mark:"),
+            TextColumn("[progress.description]{task.description}"),
+            BarColumn(),
+            MofNCompleteColumn(),
+            TaskProgressColumn(),
+            TimeElapsedColumn(),
+            TimeRemainingColumn(),
+        ) as progress,
+        ProcessPoolExecutor(max_workers=max_workers) as executor,
+    ):
+        task = progress.add_task(description, total=len(jobs))
+
+        futures = {
+            executor.submit(worker, input_path, output_path, *args): (
+                input_path,
+                output_path,
+            )
+            for input_path, output_path, args in jobs
+        }
+
+        for future in as_completed(futures):
+            input_path, output_path = futures[future]
+
+            try:
+                results.append(BatchResult(input_path, output_path, future.result()))
+                progress.console.log(f"Processed {input_path}")
+            except Exception as e:
+                results.append(BatchResult(input_path, output_path, 0, str(e)))
+                progress.console.log(
+                    f"[red]Failed {input_path}: {escape(str(e))}[/red]"
+                )
+
+            progress.advance(task)
+
+    return sorted(results, key=lambda result: result.input_path)
+
+
+def print_batch_summary(results: list[BatchResult], wall_time: float):
+    table = Table("Font", "Output", "Time", "Status")
+
+    for result in results:
+        table.add_row(
+            str(result.input_path),
+            str(result.output_path),
+            f"{result.seconds:.2f}s" if result.error is None else "-",
+            (
+                "[green]OK[/green]"
+                if result.error is None
+                else f"[red]{escape(result.error)}[/red]"
+            ),
+        )
+
+    failed = sum(result.error is not None for result in results)
+
+    console = Console()
+    console.print(table)
+    console.print(
+        f"Processed {len(results) - failed} of {len(results)} font(s) in {wall_time:.2f}s"
+        f" ({sum(result.seconds for result in results):.2f}s of work)"
+        + (f", [red]{failed} failed[/red]" if failed else "")
+    )
@@ -0,0 +1,342 @@
+import math
+import time
+import tracemalloc
+from collections.abc import Callable
+from pathlib import Path
+
+import numpy as np
+from PIL import Image
+from rich.console import Console
+from rich.markup import escape
+from rich.progress import Progress
+from rich.table import Table
+
+from northlighttools.binfnt.constants import ATLAS_NULL_COLOR
+from northlighttools.binfnt.dataclasses.benchmark_result import (
+    BenchmarkResult,
+    BenchmarkStage,
+)
+from northlighttools.binfnt.enumerators.font_version import FontVersion
+from northlighttools.binfnt.font import BinaryFont
+from northlighttools.binfnt.xml_writer import XMLWriter
+
+SYNTHETIC_FONT_NAME = "synthetic"
+
+# Power of two, so all metrics divided by it are exact in float32
+SYNTHETIC_FONT_SIZE = 32
+SYNTHETIC_LINE_HEIGHT = 40
+
+FIRST_CODEPOINT = 0x20
+LAST_CODEPOINT = 0xD7FF  # Surrogates can't be stored in metadata
+
+# R16_FLOAT alpha decode truncates, so alpha of decompiled and compiled again
+# texture may be one step lower
+R16F_ALPHA_TOLERANCE = 1
+
+
+def generate_font(
+    output_dir: Path,
+    version: FontVersion,
+    glyph_count: int,
+    atlas_size: int,
+    kerning_count: int,
+    seed: int = 0,
+) -> Path:
+    """
+    Generates synthetic font metadata and atlas with random glyph bitmaps,
+    metrics and kerning pairs, compiled to .binfnt (returned path).
+
+    All values are exactly representable in every format the font passes
+    through, so the compiled font is expected to round-trip unchanged (except
+    for texture alpha within R16F_ALPHA_TOLERANCE).
+    """
+    if not 1 <= glyph_count <= LAST_CODEPOINT - FIRST_CODEPOINT + 1:
+        raise ValueError(
+            f"Glyph count must be between 1 and {LAST_CODEPOINT - FIRST_CODEPOINT + 1}."
+        )
+
+    if atlas_size & (atlas_size - 1):
+        raise ValueError("Atlas size must be a power of two.")
+
+    # Glyphs are laid out in a grid, with at least one pixel between them
+    columns = math.ceil(math.sqrt(glyph_count))
+    cell = atlas_size // columns
+
+    if cell < 2:
+        raise ValueError(
+            f"{glyph_count} glyphs do not fit into {atlas_size}x{atlas_size} atlas."
+        )
+
+    rng = np.random.default_rng(seed)
+    source_dir = output_dir / "source"
+    source_dir.mkdir(parents=True, exist_ok=True)
+
+    # Consecutive codepoints, so the first character (which has no entry
+    # in ID table) is known as the one before the second character
+    codepoints = range(FIRST_CODEPOINT, FIRST_CODEPOINT + glyph_count)
+
+    widths = rng.integers(cell // 2, cell, glyph_count, endpoint=False)
+    heights = rng.integers(cell // 2, cell, glyph_count, endpoint=False)
+    xoffsets = rng.integers(-2, 5, glyph_count)
+    yoffsets = rng.integers(-4, 9, glyph_count)
+    xadvances = widths + rng.integers(0, 5, glyph_count)
+    channels = rng.choice([1, 2, 4], glyph_count)
+
+    atlas = np.empty((atlas_size, atlas_size, 4), dtype=np.uint8)
+    atlas[:] = ATLAS_NULL_COLOR
+
+    meta_path = source_dir / f"{SYNTHETIC_FONT_NAME}.xml"
+
+    with meta_path.open("w", encoding="utf-8") as f:
+        xml = XMLWriter(f)
+        xml.start(
+            "BinaryFont",
+            version=str(version.value),
+            line_height=str(SYNTHETIC_LINE_HEIGHT),
+            font_size=str(SYNTHETIC_FONT_SIZE),
+        )
+
+        xml.start("Characters")
+        for idx, codepoint in enumerate(codepoints):
+            x, y = idx % columns * cell, idx // columns * cell
+            width, height = int(widths[idx]), int(heights[idx])
+            xoffset, yoffset = int(xoffsets[idx]), int(yoffsets[idx])
+
+            if codepoint in [9, 10, 13, 32]:
+                # Bearings of whitespace characters are not stored
+                width = height = xoffset = 0
+                yoffset = SYNTHETIC_LINE_HEIGHT
+
+            # White pixels with random alpha, fully transparent ones are black
+            alpha = rng.integers(0, 256, (height, width), dtype=np.uint8)
+            glyph = atlas[y : y + height, x : x + width]
+            glyph[..., :3] = np.where(alpha > 0, 255, 0)[..., None]
+            glyph[..., 3] = alpha
+
+            xml.element(
+                "Character",
+                index=str(codepoint),
+                char=repr(chr(codepoint))[1:-1],
+                x=str(x),
+                y=str(y),
+                width=str(width),
+                height=str(height),
+                xoffset=str(xoffset),
+                yoffset=str(yoffset),
+                xadvance=str(int(xadvances[idx])),
+                chnl=str(channels[idx]),
+            )
+        xml.end()
+
+        xml.start("Kernings")
+        if version != FontVersion.ALAN_WAKE:
+            # Alan Wake fonts have no kerning records (only their count)
+            pairs = rng.integers(0, glyph_count, (kerning_count, 2)) + FIRST_CODEPOINT
+            amounts = rng.integers(-4, 5, kerning_count)
+
+            for (first, second), amount in zip(pairs.tolist(), amounts.tolist()):
+                xml.element(
+                    "Kerning",
+                    first=str(first),
+                    second=str(second),
+                    amount=str(float(amount)),
+                )
+        xml.end()
+
+        # Vertex indices of two triangles per character quad
+        xml.start("Unknowns")
+        for idx in range(glyph_count):
+            xml.element(
+                "Unknown",
+                **{
+                    f"n{n + 1}": str(idx * 4 + vertex)
+                    for n, vertex in enumerate([0, 1, 2, 0, 2, 3])
+                },
+            )
+        xml.end()
+
+        xml.element("Texture")
+
+        if version == FontVersion.QUANTUM_BREAK:
+            xml.element("UnknownDDSHeader", str(rng.integers(0, 1 << 63)))
+
+        xml.end()
+
+    Image.fromarray(atlas).save(meta_path.with_suffix(".png"), format="PNG")
+
+    with Progress(console=Console(quiet=True), disable=True) as progress:
+        font_path = output_dir / f"{SYNTHETIC_FONT_NAME}.binfnt"
+
+        font = BinaryFont(progress)
+        font.compile(meta_path)
+        font.save(font_path)
+
+    return font_path
+
+
+def run_benchmark(
+    work_dir: Path,
+    version: FontVersion,
+    glyph_count: int,
+    atlas_size: int,
+    kerning_count: int,
+    separate_characters: bool = False,
+    seed: int = 0,
+) -> BenchmarkResult:
+    # Decompile -> compile -> save round-trip of synthetic font, with time
+    # and peak traced memory of every stage
+    result = BenchmarkResult(version)
+    output_dir = work_dir / f"v{version.value}"
+
+    font_path = generate_font(
+        output_dir, version, glyph_count, atlas_size, kerning_count, seed
+    )
+
+    decompiled_dir = output_dir / "decompiled"
+    decompiled_dir.mkdir(exist_ok=True)
+    round_trip_path = output_dir / f"{SYNTHETIC_FONT_NAME}.round-trip.binfnt"
+
+    def measure(name: str, func: Callable):
+        tracemalloc.reset_peak()
+        start = time.perf_counter()
+        value = func()
+        seconds = time.perf_counter() - start
+
+        result.stages.append(
+            BenchmarkStage(name, seconds, tracemalloc.get_traced_memory()[1])
+        )
+        return value
+
+    def save(font: BinaryFont, texture_bytes: bytes):
+        with round_trip_path.open("wb") as writer:
+            writer.write(font.serialize_tables())
+            writer.write(font.serialize_texture_header(texture_bytes))
+            writer.write(texture_bytes)
+
+    with Progress(console=Console(quiet=True), disable=True) as progress:
+        tracemalloc.start()
+
+        try:
+            font = measure("Load", lambda: BinaryFont(progress, font_path))
+            measure("Decode texture", lambda: font.texture)
+            measure(
+                "Write XML",
+                lambda: font.write_metadata(decompiled_dir, separate_characters),
+            )
+            measure(
+                "Write PNG",
+                lambda: font.write_bitmaps(decompiled_dir, separate_characters),
+            )
+
+            font = BinaryFont(progress)
+            measure(
+                "Compile",
+                lambda: font.compile(
+                    decompiled_dir / f"{SYNTHETIC_FONT_NAME}.xml", separate_characters
+                ),
+            )
+            texture_bytes = measure("Encode texture", font.encode_texture)
+            measure("Save", lambda: save(font, texture_bytes))
+        except Exception as e:
+            result.error = str(e)
+            return result
+        finally:
+            tracemalloc.stop()
+
+    result.error = compare_fonts(font_path, round_trip_path)
+    return result
+
+
+def compare_fonts(expected_path: Path, actual_path: Path) -> str | None:
+    expected_bytes, actual_bytes = expected_path.read_bytes(), actual_path.read_bytes()
+
+    if expected_bytes == actual_bytes:
+        return None
+
+    with Progress(console=Console(quiet=True), disable=True) as progress:
+        expected = BinaryFont(progress, expected_path)
+        actual = BinaryFont(progress, actual_path)
+
+        # Tables and texture header have to match exactly, texture is compared
+        # after decoding, as R16_FLOAT decode is not the exact inverse of encode
+        header_size = len(expected.serialize_tables()) + len(
+            expected.serialize_texture_header(b"")
+        )
+        error = compare_bytes(expected_bytes[:header_size], actual_bytes[:header_size])
+
+        if error is not None:
+            return error
+
+        if expected.texture_dimensions != actual.texture_dimensions:
+            expected_width, expected_height = expected.texture_dimensions
+            actual_width, actual_height = actual.texture_dimensions
+
+            return (
+                f"Texture size differs ({expected_width}x{expected_height} != "
+                f"{actual_width}x{actual_height})"
+            )
+
+        expected_pixels = np.asarray(expected.texture, dtype=np.int16)
+        actual_pixels = np.asarray(actual.texture, dtype=np.int16)
+
+    tolerance = (
+        R16F_ALPHA_TOLERANCE if expected.version == FontVersion.QUANTUM_BREAK else 0
+    )
+    alpha_diff = np.abs(expected_pixels[..., 3] - actual_pixels[..., 3])
+
+    # Color of fully transparent pixels is not stored
+    visible = (expected_pixels[..., 3] > 0) & (actual_pixels[..., 3] > 0)
+    color_diff = (expected_pixels[..., :3] != actual_pixels[..., :3]).any(axis=-1)
+
+    mismatch = np.argwhere((alpha_diff > tolerance) | (visible & color_diff))
+
+    if len(mismatch):
+        y, x = mismatch[0]
+        return f"Texture differs at pixel ({x}, {y})"
+
+    return None
+
+
+def compare_bytes(expected: bytes, actual: bytes) -> str | None:
+    if expected == actual:
+        return None
+
+    if len(expected) != len(actual):
+        return f"Size differs ({len(expected)} != {len(actual)} bytes)"
+
+    offset = np.flatnonzero(
+        np.frombuffer(expected, np.uint8) != np.frombuffer(actual, np.uint8)
+    )[0]
+    return f"Content differs at offset {offset}"
+
+
+def print_benchmark_summary(results: list[BenchmarkResult]):
+    table = Table("Version", "Stage", "Time", "Peak memory")
+
+    for result in results:
+        version = (
+            f"{result.version.name.replace('_', ' ').title()} ({result.version.value})"
+        )
+
+        for stage in result.stages:
+            table.add_row(
+                version,
+                stage.name,
+                f"{stage.seconds * 1000:.1f}ms",
+                f"{stage.peak_memory / (1 << 20):.1f} MiB",
+            )
+            version = ""
+
+        table.add_row(
+            version,
+            "Round-trip",
+            f"{sum(stage.seconds for stage in result.stages) * 1000:.1f}ms",
+            (
+                "[green]Matches[/green]"
+                if result.error is None
+                else f"[red]{escape(result.error)}[/red]"
+            ),
+            end_section=True,
+        )
+
+    Console().print(table)
@@ -0,0 +1,155 @@
+import re
+import xml.etree.ElementTree as ET
+from pathlib import Path
+
+import numpy as np
+
+from northlighttools.binfnt.dtypes import BMFONT_CHAR_DTYPE, BMFONT_KERNING_DTYPE
+
+BINARY_MAGIC = b"BMF"
+BINARY_VERSION = 3
+
+# key=value pairs of text format, values may be quoted
+TEXT_ATTRIBUTE = re.compile(r'(\w+)=("[^"]*"|\S*)')
+
+
+class BMFont:
+    """
+    Font descriptor (.fnt) of AngelCode BMFont, in text, XML or binary format.
+    """
+
+    def __init__(self, file_path: Path):
+        self.__info: dict[str, str] = {}
+        self.__common: dict[str, str] = {}
+        self.__pages: dict[int, str] = {}
+        self.__chars = np.empty(0, dtype=BMFONT_CHAR_DTYPE)
+        self.__kernings = np.empty(0, dtype=BMFONT_KERNING_DTYPE)
+
+        data = file_path.read_bytes()
+
+        if data.startswith(BINARY_MAGIC):
+            self.__load_binary(data)
+        elif data.lstrip().startswith(b"<"):
+            self.__load_xml(file_path)
+        else:
+            self.__load_text(data.decode("utf-8-sig"))
+
+    @property
+    def font_size(self) -> int:
+        # Negative size means that it's matching character height, not cell height
+        return abs(int(self.__info.get("size", "0")))
+
+    @property
+    def line_height(self) -> int:
+        return int(self.__common.get("lineHeight", "0"))
+
+    @property
+    def base(self) -> int:
+        return int(self.__common.get("base", "0"))
+
+    @property
+    def texture_width(self) -> int:
+        return int(self.__common.get("scaleW", "0"))
+
+    @property
+    def texture_height(self) -> int:
+        return int(self.__common.get("scaleH", "0"))
+
+    @property
+    def pages(self) -> list[str]:
+        return [self.__pages[page_id] for page_id in sorted(self.__pages)]
+
+    @property
+    def chars(self) -> np.ndarray:
+        return self.__chars
+
+    @property
+    def kernings(self) -> np.ndarray:
+        return self.__kernings
+
+    def __records(self, items: list[dict[str, str]], dtype: np.dtype) -> np.ndarray:
+        return np.array(
+            [tuple(int(item.get(name, "0")) for name in dtype.names) for item in items],
+            dtype=dtype,
+        )
+
+    def __load_text(self, text: str):
+        chars, kernings = [], []
+
+        for line in text.splitlines():
+            tag, _, rest = line.strip().partition(" ")
+            attrib = {
+                key: value.strip('"') for key, value in TEXT_ATTRIBUTE.findall(rest)
+            }
+
+            match tag:
+                case "info":
+                    self.__info = attrib
+                case "common":
+                    self.__common = attrib
+                case "page":
+                    self.__pages[int(attrib["id"])] = attrib["file"]
+                case "char":
+                    chars.append(attrib)
+                case "kerning":
+                    kernings.append(attrib)
+
+        self.__chars = self.__records(chars, BMFONT_CHAR_DTYPE)
+        self.__kernings = self.__records(kernings, BMFONT_KERNING_DTYPE)
+
+    def __load_xml(self, file_path: Path):
+        root = ET.parse(file_path).getroot()
+
+        info, common = root.find("info"), root.find("common")
+
+        self.__info = dict(info.attrib) if info is not None else {}
+        self.__common = dict(common.attrib) if common is not None else {}
+        self.__pages = {
+            int(page.attrib["id"]): page.attrib["file"]
+            for page in root.iterfind("pages/page")
+        }
+
+        self.__chars = self.__records(
+            [char.attrib for char in root.iterfind("chars/char")], BMFONT_CHAR_DTYPE
+        )
+        self.__kernings = self.__records(
+            [kerning.attrib for kerning in root.iterfind("kernings/kerning")],
+            BMFONT_KERNING_DTYPE,
+        )
+
+    def __load_binary(self, data: bytes):
+        if data[3] != BINARY_VERSION:
+            raise ValueError(f"Unsupported binary BMFont version {data[3]}.")
+
+        offset = 4
+
+        while offset < len(data):
+            block_type = data[offset]
+            block_size = int.from_bytes(data[offset + 1 : offset + 5], "little")
+            block = data[offset + 5 : offset + 5 + block_size]
+            offset += 5 + block_size
+
+            match block_type:
+                case 1:
+                    self.__info = {
+                        "size": str(int.from_bytes(block[0:2], "little", signed=True)),
+                        "face": block[14:].split(b"\0", 1)[0].decode("utf-8"),
+                    }
+                case 2:
+                    self.__common = {
+                        key: str(int.from_bytes(block[idx : idx + 2], "little"))
+                        for idx, key in zip(
+                            range(0, 10, 2),
+                            ("lineHeight", "base", "scaleW", "scaleH", "pages"),
+                        )
+                    }
+                case 3:
+                    names = block.split(b"\0")[:-1]
+                    self.__pages = {
+                        page_id: name.decode("utf-8")
+                        for page_id, name in enumerate(names)
+                    }
+                case 4:
+                    self.__chars = np.frombuffer(block, dtype=BMFONT_CHAR_DTYPE)
+                case 5:
+                    self.__kernings = np.frombuffer(block, dtype=BMFONT_KERNING_DTYPE)
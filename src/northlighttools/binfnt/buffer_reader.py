@@ -0,0 +1,36 @@
+import os
+
+
+class BufferReader:
+    """
+    File-like sequential reader over a memoryview (e.g. of memory-mapped file).
+
+    Reads return views into the buffer instead of copies, they are only valid
+    as long as the buffer itself.
+    """
+
+    def __init__(self, buffer: memoryview):
+        self.__buffer = buffer
+        self.__offset = 0
+
+    def __len__(self) -> int:
+        return len(self.__buffer)
+
+    def read(self, size: int = -1) -> memoryview:
+        end = len(self.__buffer) if size < 0 else self.__offset + size
+        view = self.__buffer[self.__offset : end]
+
+        self.__offset += len(view)
+        return view
+
+    def seek(self, offset: int, whence: int = os.SEEK_SET) -> int:
+        if whence == os.SEEK_CUR:
+            offset += self.__offset
+        elif whence == os.SEEK_END:
+            offset += len(self.__buffer)
+
+        self.__offset = min(max(offset, 0), len(self.__buffer))
+        return self.__offset
+
+    def tell(self) -> int:
+        return self.__offset
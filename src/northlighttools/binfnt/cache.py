@@ -0,0 +1,236 @@
+import hashlib
+import json
+from pathlib import Path
+
+import numpy as np
+
+from northlighttools.binfnt.constants import CHARS_FOLDER, DDS_HEADER_SIZE
+from northlighttools.binfnt.dds import DDS
+from northlighttools.binfnt.enumerators.font_version import FontVersion
+from northlighttools.binfnt.font import BinaryFont
+from northlighttools.rmdp import Progress
+
+CACHE_FORMAT_VERSION = 1
+
+MANIFEST_FILE = "manifest.json"
+TABLES_FILE = "tables.bin"
+TEXTURE_FILE = "texture.dds"
+
+
+def hash_file(file_path: Path) -> str | None:
+    if not file_path.exists():
+        return None
+
+    return hashlib.sha256(file_path.read_bytes()).hexdigest()
+
+
+class BuildCache:
+    """
+    Incremental compilation of font metadata and bitmap(s) to binary font.
+
+    Serialized tables and encoded texture of the last build are kept in the
+    cache directory, together with hashes of the inputs they were built from.
+    Unchanged parts are reused, and when only some character files (or their
+    positions) changed, just their regions of R16_FLOAT texture are converted.
+    """
+
+    def __init__(self, progress: Progress, cache_dir: Path):
+        self.__progress = progress
+        self.__cache_dir = cache_dir
+
+    def __get_font_dir(self, meta_path: Path) -> Path:
+        # Every metadata file gets its own cache, so one directory can be shared
+        path_hash = hashlib.sha256(str(meta_path.resolve()).encode("utf-8"))
+        return self.__cache_dir / f"{meta_path.stem}-{path_hash.hexdigest()[:16]}"
+
+    def __load_manifest(self, font_dir: Path) -> dict | None:
+        manifest_path = font_dir / MANIFEST_FILE
+
+        if not manifest_path.exists():
+            return None
+
+        with manifest_path.open("r", encoding="utf-8") as f:
+            manifest = json.load(f)
+
+        if manifest.get("version") != CACHE_FORMAT_VERSION:
+            return None
+
+        return manifest
+
+    def __hash_inputs(
+        self, meta_path: Path, separate_characters: bool, file_names: list[str]
+    ) -> dict[str, str | None]:
+        if not separate_characters:
+            return {"atlas": hash_file(meta_path.with_suffix(".png"))}
+
+        chars_path = meta_path.parent / CHARS_FOLDER
+        return {name: hash_file(chars_path / name) for name in file_names}
+
+    def build(
+        self,
+        meta_path: Path,
+        output_path: Path,
+        separate_characters: bool = False,
+        repack: bool = False,
+        padding: int = 1,
+    ):
+        font_dir = self.__get_font_dir(meta_path)
+        manifest = self.__load_manifest(font_dir)
+
+        xml_hash = hash_file(meta_path)
+        options = [separate_characters, repack, padding]
+
+        if (
+            manifest is not None
+            and manifest["xml"] == xml_hash
+            and manifest["options"] == options
+            and manifest["inputs"]
+            == self.__hash_inputs(
+                meta_path, separate_characters, list(manifest["inputs"])
+            )
+        ):
+            self.__progress.console.log("Font is up to date, using cached build...")
+
+            self.__write(
+                output_path,
+                (font_dir / TABLES_FILE).read_bytes(),
+                bytes.fromhex(manifest["texture_header"]),
+                (font_dir / TEXTURE_FILE).read_bytes(),
+            )
+            return
+
+        font = BinaryFont(self.__progress)
+
+        if repack:
+            # Positions of all characters depend on all bitmaps, nothing to reuse
+            font.compile(meta_path, separate_characters, repack, padding)
+            texture_bytes = font.encode_texture()
+        else:
+            font.compile(meta_path, separate_characters, load_texture=False)
+            texture_bytes = self.__build_texture(
+                font, meta_path, separate_characters, options, font_dir, manifest
+            )
+
+        layout = font.character_layout
+        inputs = self.__hash_inputs(meta_path, separate_characters, list(layout))
+
+        tables = font.serialize_tables()
+        texture_header = font.serialize_texture_header(texture_bytes)
+
+        self.__write(output_path, tables, texture_header, texture_bytes)
+
+        font_dir.mkdir(parents=True, exist_ok=True)
+        (font_dir / TABLES_FILE).write_bytes(tables)
+        (font_dir / TEXTURE_FILE).write_bytes(texture_bytes)
+
+        with (font_dir / MANIFEST_FILE).open("w", encoding="utf-8") as f:
+            json.dump(
+                {
+                    "version": CACHE_FORMAT_VERSION,
+                    "xml": xml_hash,
+                    "options": options,
+                    "inputs": inputs,
+                    "layout": layout,
+                    "font_version": font.version.value,
+                    "dimensions": font.texture_dimensions,
+                    "texture_header": texture_header.hex(),
+                },
+                f,
+            )
+
+    def __build_texture(
+        self,
+        font: BinaryFont,
+        meta_path: Path,
+        separate_characters: bool,
+        options: list,
+        font_dir: Path,
+        manifest: dict | None,
+    ) -> bytes:
+        texture_path = font_dir / TEXTURE_FILE
+
+        # Cached texture can only be reused for the same format and size
+        if (
+            manifest is None
+            or manifest["options"] != options
+            or manifest["font_version"] != font.version.value
+            or tuple(manifest["dimensions"]) != font.texture_dimensions
+            or not texture_path.exists()
+        ):
+            return self.__full_build(font, meta_path)
+
+        layout = font.character_layout
+        inputs = self.__hash_inputs(meta_path, separate_characters, list(layout))
+
+        if not separate_characters:
+            if inputs != manifest["inputs"]:
+                return self.__full_build(font, meta_path)
+
+            self.__progress.console.log("Texture is unchanged, using cached texture...")
+            return texture_path.read_bytes()
+
+        # Regions of characters which were moved, resized, edited, added or removed
+        dirty = set()
+
+        for name in layout.keys() | manifest["layout"].keys():
+            old = (
+                tuple(manifest["layout"].get(name, ())),
+                manifest["inputs"].get(name),
+            )
+            new = (layout.get(name, ()), inputs.get(name))
+
+            if old != new:
+                dirty.update(rect for rect in (old[0], new[0]) if rect)
+
+        if not dirty:
+            self.__progress.console.log("Texture is unchanged, using cached texture...")
+            return texture_path.read_bytes()
+
+        if font.version != FontVersion.QUANTUM_BREAK:
+            # Other versions are saved through Pillow, not patched in place
+            return self.__full_build(font, meta_path)
+
+        self.__progress.console.log(
+            f"Updating {len(dirty)} texture region(s) of cached texture..."
+        )
+
+        texture_bytes = bytearray(texture_path.read_bytes())
+        texture_width, texture_height = font.texture_dimensions
+
+        pixels = np.frombuffer(
+            texture_bytes,
+            dtype="<u2",
+            count=texture_width * texture_height,
+            offset=DDS_HEADER_SIZE,
+        ).reshape(texture_height, texture_width)
+
+        for x, y, width, height in dirty:
+            left, top = max(x, 0), max(y, 0)
+            right = min(x + width, texture_width)
+            bottom = min(y + height, texture_height)
+
+            if left >= right or top >= bottom:
+                continue
+
+            region = font.render_texture_region(left, top, right, bottom)
+            pixels[top:bottom, left:right] = DDS.alpha_to_r16f_pixels(region[..., 3])
+
+        return bytes(texture_bytes)
+
+    def __full_build(self, font: BinaryFont, meta_path: Path) -> bytes:
+        font.load_texture(meta_path)
+        return font.encode_texture()
+
+    def __write(
+        self,
+        output_path: Path,
+        tables: bytes,
+        texture_header: bytes,
+        texture_bytes: bytes,
+    ):
+        self.__progress.console.log("Writing font to file...")
+
+        with output_path.open("wb") as writer:
+            writer.write(tables)
+            writer.write(texture_header)
+            writer.write(texture_bytes)
@@ -0,0 +1,10 @@
+from dataclasses import dataclass
+from pathlib import Path
+
+
+@dataclass
+class BatchResult:
+    input_path: Path
+    output_path: Path
+    seconds: float
+    error: str | None = None
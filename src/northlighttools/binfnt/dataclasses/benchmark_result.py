@@ -0,0 +1,17 @@
+from dataclasses import dataclass, field
+
+from northlighttools.binfnt.enumerators.font_version import FontVersion
+
+
+@dataclass
+class BenchmarkStage:
+    name: str
+    seconds: float
+    peak_memory: int  # Bytes traced by tracemalloc, including memory already in use
+
+
+@dataclass
+class BenchmarkResult:
+    version: FontVersion
+    stages: list[BenchmarkStage] = field(default_factory=list)
+    error: str | None = None  # Round-trip mismatch (or failure) description
@@ -1,67 +1,197 @@
+from functools import cache
 from io import BytesIO
-from struct import pack
 
 import numpy as np
+from PIL import Image
 
-from northlighttools.binfnt.constants import DDS_BGRA8_HEADER, DDS_R16F_HEADER
+from northlighttools.binfnt.constants import (
+    DDS_BGRA8_HEADER,
+    DDS_HEADER_SIZE,
+    DDS_R16F_HEADER,
+)
 
 
 class DDS:
 
     @staticmethod
-    def convert_to_bgra8(r16f_data: bytes):
-        reader = BytesIO(r16f_data)
+    @cache
+    def __alpha_lut() -> np.ndarray:
+        # Alpha value for every possible R16_FLOAT bit pattern, computed with the
+        # same float16 arithmetic as the original per-pixel conversion
+        values = np.arange(0x10000, dtype=np.uint16).view(np.float16)
+
+        with np.errstate(all="ignore"):
+            values = np.nan_to_num(values, nan=255)
+            return np.clip(((9 - values) * 255) / 18, 0, 255).astype(np.uint8)
+
+    @staticmethod
+    @cache
+    def __rgba_lut() -> np.ndarray:
+        # Packed RGBA pixel for every R16_FLOAT bit pattern, white with alpha
+        # (or fully transparent black)
+        alpha = DDS.__alpha_lut().astype("<u4")
+        return np.where(alpha > 0, 0x00FFFFFF, 0).astype("<u4") | (alpha << 24)
+
+    @staticmethod
+    @cache
+    def __r16f_lut() -> np.ndarray:
+        # R16_FLOAT bit pattern for every alpha value, fully transparent pixels
+        # are stored as 32767 (NaN)
+        alpha = np.arange(0x100, dtype=np.float64)
+
+        lut = (-((18) * alpha / 255.0 - 9.0)).astype(np.float16).view(np.uint16)
+        lut[0] = 32767
+
+        return lut.astype("<u2")
+
+    @staticmethod
+    def __build_header(template: bytes, width: int, height: int) -> bytes:
+        return (
+            template[:12]
+            + height.to_bytes(4, "little")
+            + width.to_bytes(4, "little")
+            + (width * 2).to_bytes(4, "little")
+            + template[24:]
+        )
+
+    @staticmethod
+    def read_dimensions(dds_data: bytes) -> tuple[int, int]:
+        # Width and height from DDS header, pixel data is not needed
+        if len(dds_data) < DDS_HEADER_SIZE or dds_data[:4] != b"DDS ":
+            raise ValueError("Texture is not a valid DDS file!")
+
+        textureHeight = int.from_bytes(dds_data[12:16], "little")
+        textureWidth = int.from_bytes(dds_data[16:20], "little")
 
-        reader.seek(12)
-        textureHeight = int.from_bytes(reader.read(4), "little")
-        textureWidth = int.from_bytes(reader.read(4), "little")
-        reader.seek(84)
+        return textureWidth, textureHeight
 
-        if int.from_bytes(reader.read(4), "little") != 111:
+    @staticmethod
+    def __read_r16f_pixels(r16f_data: bytes) -> tuple[np.ndarray, int, int]:
+        textureWidth, textureHeight = DDS.read_dimensions(r16f_data)
+
+        if int.from_bytes(r16f_data[84:88], "little") != 111:
             raise ValueError("Texture is not in R16_FLOAT pixel format!")
 
-        reader.seek(128)
+        pixels = np.frombuffer(
+            r16f_data,
+            dtype="<u2",
+            count=textureWidth * textureHeight,
+            offset=DDS_HEADER_SIZE,
+        )
+
+        return pixels, textureWidth, textureHeight
+
+    @staticmethod
+    def r16f_to_array(r16f_data: bytes) -> np.ndarray:
+        # Decodes R16_FLOAT DDS straight to (height, width, 4) RGBA pixel array,
+        # single lookup per pixel, so the result is the only allocation
+        pixels, textureWidth, textureHeight = DDS.__read_r16f_pixels(r16f_data)
+        rgba = DDS.__rgba_lut()[pixels]
+
+        return rgba.view(np.uint8).reshape(textureHeight, textureWidth, 4)
 
-        writer = BytesIO()
-        writer.write(DDS_BGRA8_HEADER[:12])
-        writer.write(textureHeight.to_bytes(4, "little"))
-        writer.write(textureWidth.to_bytes(4, "little"))
-        writer.write((textureWidth * 2).to_bytes(4, "little"))
-        writer.write(DDS_BGRA8_HEADER[24:])
+    @staticmethod
+    def r16f_to_image(r16f_data: bytes) -> Image.Image:
+        return Image.fromarray(DDS.r16f_to_array(r16f_data))
+
+    @staticmethod
+    def to_image(dds_data: bytes) -> Image.Image:
+        # Textures written through Pillow (Alan Wake fonts) are not R16_FLOAT
+        DDS.read_dimensions(dds_data)
 
-        for _ in range(textureWidth * textureHeight):
-            hGray = np.frombuffer(reader.read(2), dtype=np.float16)[0]
-            hGray = np.nan_to_num(hGray, nan=255)
-            alpha = int(np.clip(((9 - hGray) * 255) / 18, 0, 255))
-            writer.write(
-                pack("BBBB", *((255, 255, 255, alpha) if alpha > 0 else (0, 0, 0, 0)))
-            )
+        if int.from_bytes(dds_data[84:88], "little") == 111:
+            return DDS.r16f_to_image(dds_data)
 
-        return writer.getvalue()
+        rgba = DDS.__rgba32_to_array(dds_data)
+
+        if rgba is not None:
+            return Image.fromarray(rgba)
+
+        with Image.open(BytesIO(dds_data)) as image:
+            return image.convert("RGBA")
+
+    @staticmethod
+    def __rgba32_to_array(dds_data: bytes) -> np.ndarray | None:
+        # Uncompressed 32-bit pixels with every channel in its own byte, which
+        # Pillow decodes pixel by pixel
+        flags, _, bit_count, *masks = np.frombuffer(dds_data, "<u4", 7, 80).tolist()
+
+        if not flags & 0x40 or bit_count != 32:  # DDPF_RGB
+            return None
+
+        if not flags & 0x1:  # DDPF_ALPHAPIXELS
+            masks[3] = 0
+
+        # Masks of channels stored in single byte (0 for missing channel)
+        byte_masks = [0xFF << 8 * byte for byte in range(4)]
+
+        if any(mask and mask not in byte_masks for mask in masks):
+            return None
+
+        textureWidth, textureHeight = DDS.read_dimensions(dds_data)
+        pixels = np.frombuffer(
+            dds_data,
+            dtype=np.uint8,
+            count=textureWidth * textureHeight * 4,
+            offset=DDS_HEADER_SIZE,
+        ).reshape(textureHeight, textureWidth, 4)
+
+        rgba = np.empty((textureHeight, textureWidth, 4), dtype=np.uint8)
+
+        for channel, mask in enumerate(masks):
+            if mask:
+                rgba[..., channel] = pixels[..., byte_masks.index(mask)]
+            else:
+                rgba[..., channel] = 255
+
+        return rgba
+
+    @staticmethod
+    def alpha_to_r16f(alpha: np.ndarray) -> bytes:
+        # Encodes (height, width) alpha channel to R16_FLOAT DDS
+        textureHeight, textureWidth = alpha.shape
+
+        return (
+            DDS.__build_header(DDS_R16F_HEADER, textureWidth, textureHeight)
+            + DDS.alpha_to_r16f_pixels(alpha).tobytes()
+        )
+
+    @staticmethod
+    def alpha_to_r16f_pixels(alpha: np.ndarray) -> np.ndarray:
+        # R16_FLOAT pixel values (without header) for alpha channel of any shape
+        return DDS.__r16f_lut()[alpha]
+
+    @staticmethod
+    def image_to_r16f(image: Image.Image) -> bytes:
+        if image.mode != "RGBA":
+            image = image.convert("RGBA")
+
+        return DDS.alpha_to_r16f(np.asarray(image.getchannel("A")))
+
+    @staticmethod
+    def convert_to_bgra8(r16f_data: bytes):
+        pixels, textureWidth, textureHeight = DDS.__read_r16f_pixels(r16f_data)
+        alpha = DDS.__alpha_lut()[pixels]
+
+        bgra = np.zeros((alpha.size, 4), dtype=np.uint8)
+        bgra[alpha > 0, :3] = 255
+        bgra[:, 3] = alpha
+
+        return (
+            DDS.__build_header(DDS_BGRA8_HEADER, textureWidth, textureHeight)
+            + bgra.tobytes()
+        )
 
     @staticmethod
     def convert_to_r16f(bgra8_data: bytes):
-        reader = BytesIO(bgra8_data)
-
-        reader.seek(12)
-        textureHeight = int.from_bytes(reader.read(4), "little")
-        textureWidth = int.from_bytes(reader.read(4), "little")
-        reader.seek(128)
-
-        writer = BytesIO()
-        writer.write(DDS_R16F_HEADER[:12])
-        writer.write(textureHeight.to_bytes(4, "little"))
-        writer.write(textureWidth.to_bytes(4, "little"))
-        writer.write((textureWidth * 2).to_bytes(4, "little"))
-        writer.write(DDS_R16F_HEADER[24:])
-
-        for _ in range(textureWidth * textureHeight):
-            b, g, r, a = reader.read(4)
-            hGray = -((18) * a / 255.0 - 9.0)
-            writer.write(
-                np.float16(hGray).tobytes()
-                if a > 0
-                else int.to_bytes(32767, 2, "little")
-            )
-
-        return writer.getvalue()
+        textureHeight = int.from_bytes(bgra8_data[12:16], "little")
+        textureWidth = int.from_bytes(bgra8_data[16:20], "little")
+
+        alpha = np.frombuffer(
+            bgra8_data,
+            dtype=np.uint8,
+            count=textureWidth * textureHeight * 4,
+            offset=DDS_HEADER_SIZE,
+        )[3::4]
+
+        return DDS.alpha_to_r16f(alpha.reshape(textureHeight, textureWidth))
@@ -0,0 +1,60 @@
+from dataclasses import fields
+from operator import attrgetter
+
+import numpy as np
+
+from northlighttools.binfnt.dataclasses.advance import Advance
+from northlighttools.binfnt.dataclasses.character import Character
+from northlighttools.binfnt.dataclasses.character_rmd import RemedyCharacter
+from northlighttools.binfnt.dataclasses.unknown import Unknown
+from northlighttools.binfnt.enumerators.font_version import FontVersion
+
+# On-disk record layouts of .binfnt blocks (little-endian, no padding)
+CHARACTER_DTYPE = np.dtype([(field.name, "<f4") for field in fields(RemedyCharacter)])
+UNKNOWN_DTYPE = np.dtype([(field.name, "<u2") for field in fields(Unknown)])
+ADVANCE_DTYPE = np.dtype(
+    [("plus4", "<u2"), ("num4", "<u2"), ("plus6", "<u2"), ("num6", "<u2")]
+    + [("chnl", "<u4")]
+    + [(field.name, "<f4") for field in fields(Advance) if field.type is float]
+)
+
+# Kerning pairs as held in memory, converted to version specific layout on write
+KERNING_DTYPE = np.dtype([("first", "<u4"), ("second", "<u4"), ("amount", "<f8")])
+
+KERNING_DTYPES = {
+    FontVersion.ALAN_WAKE_REMASTERED: np.dtype(
+        [("first", "<u4"), ("second", "<u4"), ("amount", "<i4")]
+    ),
+    FontVersion.QUANTUM_BREAK: np.dtype(
+        [("first", "<u2"), ("second", "<u2"), ("amount", "<f4")]
+    ),
+}
+
+# Records of binary BMFont (AngelCode) .fnt files, text and XML files are
+# parsed into the same layout
+BMFONT_CHAR_DTYPE = np.dtype(
+    [("id", "<u4")]
+    + [(name, "<u2") for name in ("x", "y", "width", "height")]
+    + [(name, "<i2") for name in ("xoffset", "yoffset", "xadvance")]
+    + [("page", "u1"), ("chnl", "u1")]
+)
+BMFONT_KERNING_DTYPE = np.dtype(
+    [("first", "<u4"), ("second", "<u4"), ("amount", "<i2")]
+)
+
+# Pixel-space glyph metrics (as written to metadata) computed when decompiling
+GLYPH_DTYPE = np.dtype(
+    [
+        (field.name, {int: "<i8", float: "<f8"}[field.type])
+        for field in fields(Character)
+    ]
+)
+
+
+def to_records(items: list, dtype: np.dtype) -> np.ndarray:
+    getter = attrgetter(*dtype.names)
+    return np.array([getter(item) for item in items], dtype=dtype)
+
+
+def from_record(cls, record: np.void):
+    return cls(*record.tolist())
@@ -0,0 +1,7 @@
+from enum import Enum
+
+
+class CharacterSet(str, Enum):
+    NONE = "none"
+    ASCII = "ascii"
+    LATIN1 = "latin1"
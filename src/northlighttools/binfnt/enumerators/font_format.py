@@ -0,0 +1,6 @@
+from enum import Enum
+
+
+class FontFormat(str, Enum):
+    XML = "xml"
+    NPZ = "npz"
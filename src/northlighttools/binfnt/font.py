@@ -1,21 +1,42 @@
+import mmap
 import os
 import xml.etree.ElementTree as ET
-from dataclasses import asdict
+from collections.abc import Iterator
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
 from io import BytesIO
 from pathlib import Path
-from struct import pack, unpack
 
 import numpy as np
+from numpy.lib.recfunctions import unstructured_to_structured
 from PIL import Image
 
-from northlighttools.binfnt.constants import ATLAS_NULL_COLOR, CHARS_FOLDER
+from northlighttools.binfnt.bmfont import BMFont
+from northlighttools.binfnt.buffer_reader import BufferReader
+from northlighttools.binfnt.constants import (
+    ATLAS_NULL_COLOR,
+    CHARS_FOLDER,
+    DDS_HEADER_SIZE,
+)
 from northlighttools.binfnt.dataclasses.advance import Advance
 from northlighttools.binfnt.dataclasses.character import Character
-from northlighttools.binfnt.dataclasses.character_rmd import RemedyCharacter
 from northlighttools.binfnt.dataclasses.kerning import Kerning
 from northlighttools.binfnt.dataclasses.unknown import Unknown
 from northlighttools.binfnt.dds import DDS
+from northlighttools.binfnt.dtypes import (
+    ADVANCE_DTYPE,
+    CHARACTER_DTYPE,
+    GLYPH_DTYPE,
+    KERNING_DTYPE,
+    KERNING_DTYPES,
+    UNKNOWN_DTYPE,
+    from_record,
+    to_records,
+)
+from northlighttools.binfnt.enumerators.font_format import FontFormat
 from northlighttools.binfnt.enumerators.font_version import FontVersion
+from northlighttools.binfnt.packer import pack_rectangles
+from northlighttools.binfnt.xml_writer import XMLWriter
 from northlighttools.rmdp import Progress
 
 
@@ -25,6 +46,10 @@ class BinaryFont:
     __font_name: str = ""
 
     __texture: Image.Image | None = None
+    __texture_dimensions: tuple[int, int] = (0, 0)
+    # DDS data that was not decoded yet, either in memory or as file, offset
+    # and length of it
+    __texture_source: tuple[Path, int, int] | bytes | None = None
     __texture_size: int | None = None
     __unknown_dds_header: int | None = None
 
@@ -34,18 +59,37 @@ class BinaryFont:
     def __init__(self, progress: Progress, file_path: Path | None = None):
         self.__progress = progress
 
-        self.__characters: list[RemedyCharacter] = []
-        self.__unknowns: list[Unknown] = []
-        self.__advances: list[Advance] = []
+        # Structured arrays of CHARACTER_DTYPE/UNKNOWN_DTYPE/ADVANCE_DTYPE records
+        self.__characters = np.empty(0, dtype=CHARACTER_DTYPE)
+        self.__unknowns = np.empty(0, dtype=UNKNOWN_DTYPE)
+        self.__advances = np.empty(0, dtype=ADVANCE_DTYPE)
         self.__id_table: list[int] = []
-        self.__kernings: list[Kerning] = []
+        # Kerning pairs (KERNING_DTYPE) in file order, see __get_kerning_index
+        self.__kernings = np.empty(0, dtype=KERNING_DTYPE)
+        self.__kerning_index: tuple[np.ndarray, np.ndarray, np.ndarray] | None = None
+
+        # Pixel-space metrics of loaded characters, see __calculate_font_properties
+        self.__glyphs = np.empty(0, dtype=GLYPH_DTYPE)
+
+        # Compiled characters and their bitmap files, see compile
+        self.__chars: dict[int, Character] = {}
+        self.__char_index_map: dict[int, int] = {}
+        self.__chars_path: Path | None = None
 
         if file_path is not None:
             self.__font_name = file_path.stem
             self.__load(file_path)
 
     def __load(self, file_path: Path):
-        with file_path.open("rb") as reader:
+        if file_path.suffix.lower() == ".npz":
+            self.__load_npz(file_path)
+            self.__calculate_font_properties()
+            return
+
+        # Tables are parsed straight from the mapped file, only the parsed
+        # records are copied (so the map can be closed right after)
+        with self.__map_file(file_path) as buffer:
+            reader = BufferReader(buffer)
             self.__version = FontVersion(int.from_bytes(reader.read(4), "little"))
 
             self.__read_character_block(reader)
@@ -53,73 +97,131 @@ class BinaryFont:
             self.__read_advance_block(reader)
             self.__read_id_table(reader)
             self.__read_kerning_block(reader)
-            self.__read_texture(reader)
+            self.__read_texture(reader, file_path)
+
+        self.__calculate_font_properties()
+
+    @staticmethod
+    @contextmanager
+    def __map_file(file_path: Path) -> Iterator[memoryview]:
+        # Read-only memory map of the whole file, views into it must not
+        # outlive the context
+        with file_path.open("rb") as f:
+            if os.fstat(f.fileno()).st_size == 0:
+                raise ValueError(f"Font file {file_path} is empty.")
+
+            with (
+                mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data,
+                memoryview(data) as buffer,
+            ):
+                yield buffer
 
-            self.__calculate_font_properties()
+    def __load_npz(self, file_path: Path):
+        self.__progress.console.log("Reading font tables...")
+
+        with np.load(file_path) as data:
+            self.__version = FontVersion(data["version"].item())
+
+            self.__characters = data["characters"].astype(CHARACTER_DTYPE)
+            self.__unknowns = data["unknowns"].astype(UNKNOWN_DTYPE)
+            self.__advances = data["advances"].astype(ADVANCE_DTYPE)
+            self.__id_table = data["id_table"].tolist()
+            self.__kernings = data["kernings"].astype(KERNING_DTYPE)
+
+            if "texture_size" in data:
+                self.__texture_size = data["texture_size"].item()
+
+            if "unknown_dds_header" in data:
+                self.__unknown_dds_header = data["unknown_dds_header"].item()
+
+            self.__texture_source = data["texture"].tobytes()
+
+        self.__texture_dimensions = DDS.read_dimensions(self.__texture_source)
+
+    def __save_npz(self, output_path: Path, compress: bool):
+        self.__progress.console.log("Saving font tables...")
+
+        data = {
+            "version": np.array(self.__version.value),
+            "characters": self.__characters,
+            "unknowns": self.__unknowns,
+            "advances": self.__advances,
+            "id_table": np.array(self.__id_table, dtype="<u4"),
+            "kernings": self.__convert_kernings(
+                KERNING_DTYPES.get(
+                    self.__version, KERNING_DTYPES[FontVersion.ALAN_WAKE_REMASTERED]
+                )
+            ),
+            # Texture is stored as it is in .binfnt, without any conversion
+            "texture": np.frombuffer(self.encode_texture(), dtype=np.uint8),
+        }
+
+        if self.__texture_size is not None:
+            data["texture_size"] = np.array(self.__texture_size)
+
+        if self.__unknown_dds_header is not None:
+            data["unknown_dds_header"] = np.array(self.__unknown_dds_header, "<u8")
+
+        if compress:
+            np.savez_compressed(output_path, **data)
+        else:
+            np.savez(output_path, **data)
 
     def __read_character_block(self, reader):
         self.__progress.console.log("Reading character block...")
 
         char_count = int.from_bytes(reader.read(4), "little") // 4
-        self.__characters = []
-
-        for _ in range(char_count):
-            self.__characters.append(RemedyCharacter(*unpack("16f", reader.read(64))))
+        self.__characters = self.__read_records(reader, CHARACTER_DTYPE, char_count)
 
     def __read_unknown_block(self, reader):
         self.__progress.console.log("Reading unknown block...")
 
         reader.seek(4, os.SEEK_CUR)  # Skip 4 bytes (integer // 6 = character count)
-        self.__unknowns = []
-
-        for _ in range(len(self.__characters)):
-            self.__unknowns.append(Unknown(*unpack("6H", reader.read(12))))
+        self.__unknowns = self.__read_records(
+            reader, UNKNOWN_DTYPE, len(self.__characters)
+        )
 
     def __read_advance_block(self, reader):
         self.__progress.console.log("Reading advance block...")
 
         reader.seek(4, os.SEEK_CUR)  # Skip 4 bytes (integer = character count)
-        self.__advances = []
+        self.__advances = self.__read_records(
+            reader, ADVANCE_DTYPE, len(self.__characters)
+        )
 
-        for _ in range(len(self.__characters)):
-            self.__advances.append(Advance(*unpack("4HI8f", reader.read(44))))
+    def __read_records(
+        self, reader: BufferReader, dtype: np.dtype, count: int
+    ) -> np.ndarray:
+        with reader.read(dtype.itemsize * count) as data:
+            if len(data) != dtype.itemsize * count:
+                raise ValueError("Unexpected end of file while reading font data.")
+
+            return np.frombuffer(data, dtype=dtype).copy()
 
     def __read_id_table(self, reader):
         self.__progress.console.log("Reading ID table...")
 
-        start_pos = reader.tell()
-        current_id = 0
-
-        self.__id_table = []
-
-        while ((reader.tell() - start_pos) / 2) <= 0xFFFF:
-            idx = int.from_bytes(reader.read(2), "little")
-
-            if idx != 0:
-                self.__id_table.append(current_id)
-
-            current_id += 1
+        # Character index for every codepoint, zero for codepoints without
+        # character (and for the first character, which has index 0)
+        id_table = self.__read_records(reader, np.dtype("<u2"), 0xFFFF + 1)
 
+        self.__id_table = np.flatnonzero(id_table).tolist()
         self.__id_table.insert(0, self.__id_table[0] - 1)
 
     def __read_kerning_block(self, reader):
         self.__progress.console.log("Reading kerning block...")
 
         kerning_count = int.from_bytes(reader.read(4), "little")
-        self.__kernings = []
 
-        match self.__version:
-            case FontVersion.ALAN_WAKE_REMASTERED:
-                fmt, size = "2Ii", 12
-            case FontVersion.QUANTUM_BREAK:
-                fmt, size = "2Hf", 8
-            case _:
-                return
+        if self.__version not in KERNING_DTYPES:
+            self.__kernings = np.empty(0, dtype=KERNING_DTYPE)
+            return
 
-        for _ in range(kerning_count):
-            self.__kernings.append(Kerning(*unpack(fmt, reader.read(size))))
+        self.__kernings = self.__read_records(
+            reader, KERNING_DTYPES[self.__version], kerning_count
+        ).astype(KERNING_DTYPE)
 
-    def __read_texture(self, reader):
+    def __read_texture(self, reader: BufferReader, file_path: Path):
         self.__progress.console.log("Reading texture metadata...")
 
         if self.__version in [FontVersion.ALAN_WAKE, FontVersion.ALAN_WAKE_REMASTERED]:
@@ -127,14 +229,177 @@ class BinaryFont:
         elif self.__version == FontVersion.QUANTUM_BREAK:
             self.__unknown_dds_header = int.from_bytes(reader.read(8), "little")
 
-        self.__progress.console.log("Converting texture to BGRA8 format...")
-        converted_texture = DDS.convert_to_bgra8(reader.read())
+        # Only dimensions are read here, texture is decoded when first accessed
+        offset = reader.tell()
+
+        with reader.read(DDS_HEADER_SIZE) as header:
+            self.__texture_dimensions = DDS.read_dimensions(header)
+
+        self.__texture_source = (file_path, offset, len(reader) - offset)
+
+    @contextmanager
+    def __map_texture_data(self) -> Iterator[memoryview | bytes]:
+        if self.__texture_source is None:
+            raise ValueError("Font was not loaded from a file.")
+
+        if isinstance(self.__texture_source, bytes):
+            yield self.__texture_source
+            return
+
+        file_path, offset, length = self.__texture_source
+
+        with self.__map_file(file_path) as buffer:
+            if offset + length != len(buffer):
+                raise ValueError(f"Font file {file_path} changed since it was loaded.")
+
+            with buffer[offset:] as texture_data:
+                yield texture_data
+
+    def __read_texture_data(self) -> bytes:
+        with self.__map_texture_data() as texture_data:
+            return bytes(texture_data)
+
+    @property
+    def texture(self) -> Image.Image | None:
+        if self.__texture is None and self.__texture_source is not None:
+            self.__progress.console.log("Decoding texture...")
+
+            # Pixels are converted directly from the mapped file
+            with self.__map_texture_data() as texture_data:
+                self.__texture = DDS.to_image(texture_data)
+
+        return self.__texture
+
+    @property
+    def texture_dimensions(self) -> tuple[int, int]:
+        if self.__texture is not None:
+            return self.__texture.size
+
+        return self.__texture_dimensions
+
+    @property
+    def version(self) -> FontVersion:
+        return self.__version
+
+    @property
+    def line_height(self) -> float:
+        return self.__line_height
+
+    @property
+    def font_size(self) -> float:
+        return self.__font_size
+
+    @property
+    def character_count(self) -> int:
+        return len(self.__characters)
+
+    @property
+    def kerning_count(self) -> int:
+        return len(self.__kernings)
+
+    @property
+    def kernings(self) -> np.ndarray:
+        return self.__kernings
+
+    @staticmethod
+    def __kerning_keys(kernings: np.ndarray) -> np.ndarray:
+        # (first, second) pairs packed to single sortable integer
+        return (kernings["first"].astype(np.uint64) << 32) | kernings["second"]
+
+    def __get_kerning_index(self) -> tuple[np.ndarray, np.ndarray]:
+        # Sorted (first, second) keys and their positions in the kerning table,
+        # rebuilt whenever the table is replaced
+        if (
+            self.__kerning_index is None
+            or self.__kerning_index[0] is not self.__kernings
+        ):
+            keys = self.__kerning_keys(self.__kernings)
+            order = np.argsort(keys, kind="stable")
+            self.__kerning_index = (self.__kernings, keys[order], order)
+
+        return self.__kerning_index[1], self.__kerning_index[2]
+
+    def get_kerning(self, first: int, second: int) -> float | None:
+        # Amount of the first pair in the table, in metadata (pixel) units
+        keys, order = self.__get_kerning_index()
+        key = (first << 32) | second
+
+        idx = np.searchsorted(keys, key)
+
+        if idx == len(keys) or keys[idx] != key:
+            return None
+
+        kerning = Kerning(*self.__kernings[order[idx]].tolist())
+        return kerning.without_font_size(self.__font_size, self.__version).amount
+
+    def deduplicate_kernings(self) -> int:
+        # Only the first occurrence of every pair is kept (the one found by lookup)
+        keys, order = self.__get_kerning_index()
+
+        unique = np.ones(len(keys), dtype=bool)
+        unique[1:] = keys[1:] != keys[:-1]
 
-        self.__progress.console.log("Loading texture into memory...")
-        self.__texture = Image.open(BytesIO(converted_texture))
+        keep = np.zeros(len(keys), dtype=bool)
+        keep[order[unique]] = True
+
+        return self.__filter_kernings(keep)
+
+    def prune_kernings(self) -> int:
+        # Removes pairs without effect or referencing characters not in the font
+        keep = (
+            (self.__kernings["amount"] != 0)
+            & np.isin(self.__kernings["first"], self.__id_table)
+            & np.isin(self.__kernings["second"], self.__id_table)
+        )
+
+        return self.__filter_kernings(keep)
+
+    def __filter_kernings(self, keep: np.ndarray) -> int:
+        removed = int(len(keep) - keep.sum())
+
+        if removed:
+            self.__kernings = self.__kernings[keep]
+
+        return removed
+
+    def merge_kernings(self, kernings: np.ndarray) -> tuple[int, int]:
+        # Pairs (first, second, amount in pixels) replace existing pairs and the
+        # rest is appended, returns number of replaced and added pairs
+        merged = np.empty(len(kernings), dtype=KERNING_DTYPE)
+        merged["first"] = kernings["first"]
+        merged["second"] = kernings["second"]
+
+        if self.__version in [FontVersion.ALAN_WAKE, FontVersion.ALAN_WAKE_REMASTERED]:
+            merged["amount"] = kernings["amount"] * self.__font_size
+        else:
+            merged["amount"] = kernings["amount"] / self.__font_size
+
+        # Last occurrence wins within merged pairs
+        merged_keys = self.__kerning_keys(merged)
+        _, last = np.unique(merged_keys[::-1], return_index=True)
+        last = np.sort(len(merged) - 1 - last)
+        merged, merged_keys = merged[last], merged_keys[last]
+
+        keys, order = self.__get_kerning_index()
+        idx = np.minimum(np.searchsorted(keys, merged_keys), max(len(keys) - 1, 0))
+        existing = (
+            keys[idx] == merged_keys if len(keys) else np.zeros(len(merged), bool)
+        )
+
+        kernings = self.__kernings.copy()
+        kernings["amount"][order[idx[existing]]] = merged["amount"][existing]
+        self.__kernings = np.concatenate([kernings, merged[~existing]])
+
+        return int(existing.sum()), int((~existing).sum())
+
+    def sort_kernings(self):
+        _, order = self.__get_kerning_index()
+        self.__kernings = self.__kernings[order]
 
     def __calculate_font_properties(self):
-        if not self.__texture:
+        texture_width, texture_height = self.texture_dimensions
+
+        if not texture_width or not texture_height:
             self.__progress.console.log(
                 "No texture loaded, cannot calculate font properties."
             )
@@ -142,130 +407,171 @@ class BinaryFont:
 
         self.__progress.console.log("Calculating font properties...")
 
-        line_heights, sizes = [], []
+        # Same double precision arithmetic as RemedyCharacter.to_point,
+        # but for all characters at once
+        chars = self.__characters
 
-        for idx, char in enumerate(self.__characters):
-            point = char.to_point(
-                texture_width=self.__texture.width,
-                texture_height=self.__texture.height,
-            )
+        def column(array: np.ndarray, name: str) -> np.ndarray:
+            return array[name].astype(np.float64)
 
-            try:
-                size = point.height / (char.bearingY1_1 - char.bearingY2_1)
-            except ZeroDivisionError:
-                size = 0
+        x = column(chars, "xMin_1") * texture_width
+        y = column(chars, "yMin_1") * texture_height
+        width = column(chars, "xMax_1") * texture_width - x
+        height = column(chars, "yMax_1") * texture_height - y
 
-            line_height = (
-                -self.__advances[idx].yoffset2_1 * size
-                + point.height
-                + char.bearingY2_1 * size
-            )
+        bearing_y1 = column(chars, "bearingY1_1")
+        bearing_y2 = column(chars, "bearingY2_1")
+        bearing_height = bearing_y1 - bearing_y2
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            sizes = np.where(bearing_height != 0, height / bearing_height, 0.0)
 
-            line_heights.append(line_height)
-            sizes.append(size)
+        line_heights = (
+            -column(self.__advances, "yoffset2_1") * sizes + height + bearing_y2 * sizes
+        )
 
-        self.__line_height = (
-            max(set(line_heights), key=line_heights.count) if line_heights else 0
+        self.__line_height = self.__most_common(line_heights)
+        self.__font_size = self.__most_common(sizes)
+
+        # Pixel-space metrics of every character, shared by metadata and bitmap export
+        glyphs = np.empty(len(chars), dtype=GLYPH_DTYPE)
+        glyphs["x"] = np.rint(x)
+        glyphs["y"] = np.rint(y)
+        glyphs["width"] = np.rint(width)
+        glyphs["height"] = np.rint(height)
+        glyphs["xoffset"] = column(chars, "bearingX1_1") * self.__font_size
+        glyphs["yoffset"] = self.__line_height - bearing_y2 * self.__font_size - height
+        glyphs["xadvance"] = column(self.__advances, "xadvance2_1") * self.__font_size
+        channels = self.__advances["chnl"]
+        glyphs["chnl"] = np.select(
+            [channels == 0, channels == 1, channels == 2], [4, 2, 1], 0
         )
-        self.__font_size = max(set(sizes), key=sizes.count) if sizes else 0
+
+        self.__glyphs = glyphs
+
+    @staticmethod
+    def __most_common(values: np.ndarray) -> float:
+        # Ties are resolved in favour of the smallest value
+        if values.size == 0:
+            return 0
+
+        unique, counts = np.unique(values, return_counts=True)
+        return unique[np.argmax(counts)].item()
 
     def __get_character_by_id(self, char_id: int) -> str:
         return repr(str(chr(self.__id_table[char_id])))[1:-1]
 
-    def decompile(self, output_path: Path, separate_characters: bool = False):
-        if not self.__texture:
+    def decompile(
+        self,
+        output_path: Path,
+        separate_characters: bool = False,
+        font_format: FontFormat = FontFormat.XML,
+        compress: bool = False,
+    ):
+        if font_format == FontFormat.NPZ:
+            self.__save_npz(output_path / f"{self.__font_name}.npz", compress)
+            return
+
+        if not self.texture:
             self.__progress.console.log("No texture data available, cannot save font.")
             return
 
+        self.write_metadata(output_path, separate_characters)
+        self.write_bitmaps(output_path, separate_characters)
+
+    def write_metadata(self, output_path: Path, separate_characters: bool = False):
         self.__progress.console.log("Saving font data...")
 
         # Dump the font data to a xml file
         font_path = output_path / f"{self.__font_name}.xml"
-
-        root = ET.Element(
-            "BinaryFont",
-            version=str(self.__version.value),
-            line_height=str(self.__line_height),
-            font_size=str(self.__font_size),
-        )
-
-        # Characters
-        chars_elem = ET.SubElement(root, "Characters")
-        for char_id, char in enumerate(self.__characters):
-            char_data = char.to_character(
-                texture_width=self.__texture.width,
-                texture_height=self.__texture.height,
-                advance=self.__advances[char_id],
-                line_height=self.__line_height,
-                font_size=self.__font_size,
+        texture_width, texture_height = self.texture_dimensions
+
+        with font_path.open("w", encoding="utf-8", errors="xmlcharrefreplace") as f:
+            xml = XMLWriter(f)
+            xml.start(
+                "BinaryFont",
+                version=str(self.__version.value),
+                line_height=str(self.__line_height),
+                font_size=str(self.__font_size),
             )
 
-            ET.SubElement(
-                chars_elem,
-                "Character",
-                index=str(self.__id_table[char_id]),
-                char=self.__get_character_by_id(char_id),
-                x=str(char_data.x),
-                y=str(char_data.y),
-                width=str(char_data.width),
-                height=str(char_data.height),
-                xoffset=str(char_data.xoffset),
-                yoffset=str(char_data.yoffset),
-                xadvance=str(char_data.xadvance),
-                chnl=str(char_data.chnl),
-            )
+            # Characters
+            xml.start("Characters")
+            for char_id, glyph in enumerate(self.__glyphs.tolist()):
+                char_data = Character(*glyph)
+
+                xml.element(
+                    "Character",
+                    index=str(self.__id_table[char_id]),
+                    char=self.__get_character_by_id(char_id),
+                    x=str(char_data.x),
+                    y=str(char_data.y),
+                    width=str(char_data.width),
+                    height=str(char_data.height),
+                    xoffset=str(char_data.xoffset),
+                    yoffset=str(char_data.yoffset),
+                    xadvance=str(char_data.xadvance),
+                    chnl=str(char_data.chnl),
+                )
+            xml.end()
 
-        # Kernings
-        kerns_elem = ET.SubElement(root, "Kernings")
-        for kern in self.__kernings:
-            ET.SubElement(
-                kerns_elem,
-                "Kerning",
-                first=str(kern.first),
-                second=str(kern.second),
-                amount=str(kern.amount),
-            )
+            # Kernings
+            xml.start("Kernings")
+            for kern in self.__kernings.tolist():
+                kern = Kerning(*kern).without_font_size(
+                    self.__font_size, self.__version
+                )
+                xml.element(
+                    "Kerning",
+                    first=str(kern.first),
+                    second=str(kern.second),
+                    amount=str(kern.amount),
+                )
+            xml.end()
+
+            # Unknowns
+            xml.start("Unknowns")
+            for record in self.__unknowns:
+                unk = from_record(Unknown, record)
+                xml.element(
+                    "Unknown",
+                    n1=str(unk.n1),
+                    n2=str(unk.n2),
+                    n3=str(unk.n3),
+                    n4=str(unk.n4),
+                    n5=str(unk.n5),
+                    n6=str(unk.n6),
+                )
+            xml.end()
 
-        # Unknowns
-        unks_elem = ET.SubElement(root, "Unknowns")
-        for unk in self.__unknowns:
-            ET.SubElement(
-                unks_elem,
-                "Unknown",
-                n1=str(unk.n1),
-                n2=str(unk.n2),
-                n3=str(unk.n3),
-                n4=str(unk.n4),
-                n5=str(unk.n5),
-                n6=str(unk.n6),
-            )
+            # Texture
+            xml.start("Texture")
+            if self.__texture_size is not None:
+                xml.element("Size", str(self.__texture_size))
 
-        # Texture
-        texture_elem = ET.SubElement(root, "Texture")
-        if self.__texture_size is not None:
-            ET.SubElement(texture_elem, "Size").text = str(self.__texture_size)
+            if separate_characters:
+                xml.element("Width", str(texture_width))
+                xml.element("Height", str(texture_height))
+            xml.end()
 
-        if separate_characters:
-            ET.SubElement(texture_elem, "Width").text = str(self.__texture.width)
-            ET.SubElement(texture_elem, "Height").text = str(self.__texture.height)
+            # Unknown DDS Header
+            if self.__unknown_dds_header is not None:
+                xml.element("UnknownDDSHeader", str(self.__unknown_dds_header))
 
-        # Unknown DDS Header
-        if self.__unknown_dds_header is not None:
-            ET.SubElement(
-                root,
-                "UnknownDDSHeader",
-            ).text = str(self.__unknown_dds_header)
+            xml.end()
 
-        tree = ET.ElementTree(root)
-        ET.indent(tree)
-        tree.write(font_path, encoding="utf-8", xml_declaration=True)
+    def write_bitmaps(self, output_path: Path, separate_characters: bool = False):
+        texture = self.texture
+
+        if not texture:
+            raise ValueError("Texture is not loaded. Cannot save bitmap(s).")
 
         if not separate_characters:
             # Save the texture as a PNG file
             self.__progress.console.log("Saving texture as a PNG file...")
 
-            texture_path = font_path.with_suffix(".png")
-            self.__texture.save(texture_path, format="PNG")
+            texture_path = output_path / f"{self.__font_name}.png"
+            texture.save(texture_path, format="PNG")
             return
 
         # Save each character as a separate PNG file
@@ -273,158 +579,420 @@ class BinaryFont:
         chars_dir = output_path / CHARS_FOLDER
         chars_dir.mkdir(parents=True, exist_ok=True)
 
-        for char_id, char in enumerate(self.__characters):
-            char_data = char.to_character(
-                texture_width=self.__texture.width,
-                texture_height=self.__texture.height,
-                advance=self.__advances[char_id],
-                line_height=self.__line_height,
-                font_size=self.__font_size,
-            )
-
-            if char_data.width == 0 or char_data.height == 0:
-                continue
+        atlas = np.asarray(texture)
 
-            char_texture = self.__texture.crop(
-                (
+        def save_character(char_id: int, char_data: Character):
+            char_texture = Image.fromarray(
+                self.__crop(
+                    atlas,
                     char_data.x,
                     char_data.y,
-                    char_data.x + char_data.width,
-                    char_data.y + char_data.height,
+                    char_data.width,
+                    char_data.height,
                 )
             )
 
             char_texture_path = chars_dir / f"{self.__id_table[char_id]}.png"
             char_texture.save(char_texture_path, format="PNG")
 
+        # PNG encoding releases the GIL, so characters are saved concurrently
+        with ThreadPoolExecutor() as executor:
+            futures = [
+                executor.submit(save_character, char_id, char_data)
+                for char_id, char_data in enumerate(
+                    Character(*glyph) for glyph in self.__glyphs.tolist()
+                )
+                if char_data.width != 0 and char_data.height != 0
+            ]
+
+            for future in futures:
+                future.result()
+
+    @staticmethod
+    def __crop(atlas: np.ndarray, x: int, y: int, width: int, height: int):
+        atlas_height, atlas_width = atlas.shape[:2]
+
+        if (
+            x >= 0
+            and y >= 0
+            and x + width <= atlas_width
+            and y + height <= atlas_height
+        ):
+            return atlas[y : y + height, x : x + width]
+
+        # Same as Image.crop, area outside of the atlas is transparent black
+        result = np.zeros((height, width, atlas.shape[2]), dtype=atlas.dtype)
+
+        left, top = max(x, 0), max(y, 0)
+        right, bottom = min(x + width, atlas_width), min(y + height, atlas_height)
+
+        if left < right and top < bottom:
+            result[top - y : bottom - y, left - x : right - x] = atlas[
+                top:bottom, left:right
+            ]
+
+        return result
+
+    @staticmethod
+    def __paste(atlas: np.ndarray, image: np.ndarray, x: int, y: int):
+        # Same as Image.paste, parts outside of the atlas are clipped
+        atlas_height, atlas_width = atlas.shape[:2]
+        height, width = image.shape[:2]
+
+        left, top = max(x, 0), max(y, 0)
+        right, bottom = min(x + width, atlas_width), min(y + height, atlas_height)
+
+        if left < right and top < bottom:
+            atlas[top:bottom, left:right] = image[
+                top - y : bottom - y, left - x : right - x
+            ]
+
     def __char_to_id(self, char_id: str) -> int:
         try:
             return ord(char_id.encode("utf-8").decode("unicode_escape"))
         except:
             return ord(char_id)
 
-    def compile(self, meta_path: Path, separate_characters: bool = False):
+    def compile(
+        self,
+        meta_path: Path,
+        separate_characters: bool = False,
+        repack: bool = False,
+        padding: int = 1,
+        codepoints: set[int] | None = None,
+        load_texture: bool = True,
+    ):
         self.__progress.console.log("Loading font data...")
 
-        with meta_path.open("r", encoding="utf-8") as f:
-            font_data = ET.parse(f).getroot()
+        chars: dict[int, Character] = {}
+        char_index_map: dict[int, int] = {}
+        kernings: list[Kerning] = []
+        unknowns: list[Unknown] = []
+        # Text of Texture/Size, Texture/Width, Texture/Height and UnknownDDSHeader
+        values: dict[str, str | None] = {}
+        found: set[str] = set()
+
+        # Elements are processed (and cleared) as soon as they are parsed,
+        # so the whole document is never kept in memory
+        path: list[ET.Element] = []
+
+        with meta_path.open("rb") as f:
+            for event, elem in ET.iterparse(f, events=("start", "end")):
+                if event == "start":
+                    path.append(elem)
+
+                    if len(path) == 1:
+                        self.__version = FontVersion(
+                            int(
+                                elem.attrib.get(
+                                    "version", str(FontVersion.QUANTUM_BREAK.value)
+                                )
+                            )
+                        )
+                        self.__line_height = float(elem.attrib.get("line_height", "0"))
+                        self.__font_size = float(elem.attrib.get("font_size", "0"))
+                    elif len(path) == 2:
+                        found.add(elem.tag)
 
-        if not separate_characters:
+                    continue
+
+                path.pop()
+                parent = "/".join(element.tag for element in path[1:])
+
+                match parent, elem.tag:
+                    case "Characters", "Character":
+                        char_id = elem.attrib.get("char")
+
+                        if char_id is None:
+                            raise ValueError(
+                                "Character ID (char attribute) is missing in XML."
+                            )
+
+                        char_id = self.__char_to_id(char_id)
+
+                        chars[char_id] = Character(
+                            x=int(elem.attrib.get("x", "0")),
+                            y=int(elem.attrib.get("y", "0")),
+                            width=int(elem.attrib.get("width", "0")),
+                            height=int(elem.attrib.get("height", "0")),
+                            xoffset=float(elem.attrib.get("xoffset", "0")),
+                            yoffset=float(elem.attrib.get("yoffset", "0")),
+                            xadvance=float(elem.attrib.get("xadvance", "0")),
+                            chnl=int(elem.attrib.get("chnl", "0")),
+                        )
+                        char_index_map[char_id] = int(elem.attrib.get("index", "0"))
+                    case "Kernings", "Kerning":
+                        kernings.append(
+                            Kerning(
+                                first=int(elem.attrib.get("first", "0")),
+                                second=int(elem.attrib.get("second", "0")),
+                                amount=float(elem.attrib.get("amount", "0")),
+                            ).with_font_size(self.__font_size, self.__version)
+                        )
+                    case "Unknowns", "Unknown":
+                        unknowns.append(
+                            Unknown(
+                                n1=int(elem.attrib.get("n1", "0")),
+                                n2=int(elem.attrib.get("n2", "0")),
+                                n3=int(elem.attrib.get("n3", "0")),
+                                n4=int(elem.attrib.get("n4", "0")),
+                                n5=int(elem.attrib.get("n5", "0")),
+                                n6=int(elem.attrib.get("n6", "0")),
+                            )
+                        )
+                    case ("Texture", _) | ("", "UnknownDDSHeader"):
+                        values[f"{parent}/{elem.tag}".lstrip("/")] = elem.text
+                    case _:
+                        continue
+
+                # Drop the processed element from its (cleared) parent
+                path[-1].clear()
+
+        if "Characters" not in found:
+            raise ValueError("Characters element not found in metadata file.")
+
+        if "Kernings" not in found:
+            raise ValueError("Kernings element not found in metadata file.")
+
+        if "Unknowns" not in found:
+            raise ValueError("Unknowns element not found in metadata file.")
+
+        if repack:
+            # Atlas size is decided by the packer
+            texture_width = texture_height = 0
+        elif not separate_characters:
             texture_width, texture_height = Image.open(
                 meta_path.with_suffix(".png")
             ).size
         else:
-            __texture_width = font_data.find("Texture/Width")
-            __texture_height = font_data.find("Texture/Height")
+            __texture_width = values.get("Texture/Width")
+            __texture_height = values.get("Texture/Height")
 
-            if (__texture_width is None or __texture_width.text is None) or (
-                __texture_height is None or __texture_height.text is None
-            ):
+            if __texture_width is None or __texture_height is None:
                 raise ValueError(
                     "Texture width and height elements must be provided for separate characters."
                 )
 
-            texture_width = int(__texture_width.text)
-            texture_height = int(__texture_height.text)
+            texture_width = int(__texture_width)
+            texture_height = int(__texture_height)
 
-        self.__version = FontVersion(
-            int(font_data.attrib.get("version", str(FontVersion.QUANTUM_BREAK.value)))
-        )
-        self.__line_height = float(font_data.attrib.get("line_height", "0"))
-        self.__font_size = float(font_data.attrib.get("font_size", "0"))
+        if codepoints is not None:
+            # Characters kept in the subset, in their original order
+            kept = np.array([char_id in codepoints for char_id in chars], dtype=bool)
 
-        characters_elem = font_data.find("Characters")
-        if characters_elem is None:
-            raise ValueError("Characters element not found in metadata file.")
+            self.__progress.console.log(
+                f"Keeping {kept.sum()} out of {len(chars)} characters..."
+            )
+
+            chars = {
+                char_id: char_data
+                for char_id, char_data in chars.items()
+                if char_id in codepoints
+            }
 
-        chars = {}
-        char_index_map = {}
+        if repack:
+            texture_width, texture_height = self.__repack_texture(
+                meta_path, chars, char_index_map, separate_characters, padding
+            )
 
-        for char_elem in characters_elem.findall("Character"):
-            char_id = char_elem.attrib.get("char")
+        self.__chars = chars
+        self.__char_index_map = char_index_map
+        self.__chars_path = meta_path.parent / CHARS_FOLDER
+        self.__convert_characters(chars, texture_width, texture_height)
 
-            if char_id is None:
-                raise ValueError("Character ID (char attribute) is missing in XML.")
+        self.__kernings = to_records(kernings, KERNING_DTYPE)
 
-            char_id = self.__char_to_id(char_id)
+        if codepoints is not None:
+            # Drop pairs referencing removed characters
+            self.__kernings = self.__kernings[
+                np.isin(self.__kernings["first"], list(chars))
+                & np.isin(self.__kernings["second"], list(chars))
+            ]
 
-            char_data = {
-                "x": int(char_elem.attrib.get("x", "0")),
-                "y": int(char_elem.attrib.get("y", "0")),
-                "width": int(char_elem.attrib.get("width", "0")),
-                "height": int(char_elem.attrib.get("height", "0")),
-                "xoffset": float(char_elem.attrib.get("xoffset", "0")),
-                "yoffset": float(char_elem.attrib.get("yoffset", "0")),
-                "xadvance": float(char_elem.attrib.get("xadvance", "0")),
-                "chnl": int(char_elem.attrib.get("chnl", "0")),
-            }
+        self.__unknowns = to_records(unknowns, UNKNOWN_DTYPE)
+
+        if codepoints is not None:
+            self.__unknowns = self.__subset_unknowns(self.__unknowns, kept)
+
+        if values.get("Texture/Size") is not None:
+            self.__texture_size = int(values["Texture/Size"])
 
-            chars[char_id] = Character(**char_data)
-            char_index_map[char_id] = int(char_elem.attrib.get("index", "0"))
+        if values.get("UnknownDDSHeader") is not None:
+            self.__unknown_dds_header = int(values["UnknownDDSHeader"])
 
-        self.__characters = [
-            chars[char_id].to_remedy_character(
-                char_id,
-                texture_width,
-                texture_height,
-                self.__line_height,
-                self.__font_size,
+        if repack or not load_texture:
+            # Texture was already rebuilt before the characters were converted
+            # (or it is going to be loaded later by the caller)
+            return
+
+        self.load_texture(meta_path)
+
+    def compile_bmfont(
+        self,
+        fnt_path: Path,
+        version: FontVersion = FontVersion.QUANTUM_BREAK,
+        repack: bool = False,
+        padding: int = 1,
+    ):
+        self.__progress.console.log("Loading BMFont data...")
+
+        bmfont = BMFont(fnt_path)
+
+        if not bmfont.font_size:
+            raise ValueError(f"Font size is missing in {fnt_path}.")
+
+        self.__version = version
+        # Remedy fonts measure vertical offsets from baseline, BMFont from
+        # top of the line, so its base is used as line height
+        self.__line_height = float(bmfont.base)
+        self.__font_size = float(bmfont.font_size)
+
+        records = bmfont.chars[np.argsort(bmfont.chars["id"], kind="stable")]
+        out_of_range = records["id"] > 0xFFFF
+
+        if out_of_range.any():
+            # ID table only covers Basic Multilingual Plane
+            self.__progress.console.log(
+                f"Warning: Skipping {out_of_range.sum()} characters outside of BMP."
             )
-            for char_id in chars.keys()
-        ]
+            records = records[~out_of_range]
 
-        self.__advances = [
-            Advance.calculate_values(
-                char,
-                idx,
-                self.__font_size,
+        chars: dict[int, Character] = {}
+        char_pages: dict[int, int] = {}
+
+        for record in records.tolist():
+            char_id, x, y, width, height, xoffset, yoffset, xadvance, page, chnl = (
+                record
             )
-            for idx, char in enumerate(chars.values())
-        ]
 
-        kernings_elem = font_data.find("Kernings")
+            chars[char_id] = Character(
+                x=x,
+                y=y,
+                width=width,
+                height=height,
+                xoffset=float(xoffset),
+                yoffset=float(yoffset),
+                xadvance=float(xadvance),
+                chnl=chnl,
+            )
+            char_pages[char_id] = page
 
-        if kernings_elem is None:
-            raise ValueError("Kernings element not found in metadata file.")
+        page_paths = [fnt_path.parent / page for page in bmfont.pages]
 
-        self.__kernings = [
-            Kerning(
-                first=int(kerning_elem.attrib.get("first", "0")),
-                second=int(kerning_elem.attrib.get("second", "0")),
-                amount=float(kerning_elem.attrib.get("amount", "0")),
-            ).with_font_size(self.__font_size, self.__version)
-            for kerning_elem in kernings_elem.findall("Kerning")
-        ]
+        for page_path in page_paths:
+            if not page_path.exists():
+                raise FileNotFoundError(f"BMFont page is missing: {page_path}")
 
-        unknowns_elem = font_data.find("Unknowns")
-        if unknowns_elem is None:
-            raise ValueError("Unknowns element not found in metadata file.")
+        for char_id, page in char_pages.items():
+            if page >= len(page_paths):
+                raise ValueError(f"Character {char_id} is on missing page {page}.")
 
-        self.__unknowns = [
-            Unknown(
-                n1=int(unknown_elem.attrib.get("n1", "0")),
-                n2=int(unknown_elem.attrib.get("n2", "0")),
-                n3=int(unknown_elem.attrib.get("n3", "0")),
-                n4=int(unknown_elem.attrib.get("n4", "0")),
-                n5=int(unknown_elem.attrib.get("n5", "0")),
-                n6=int(unknown_elem.attrib.get("n6", "0")),
+        if len(page_paths) == 1 and not repack:
+            # Single page is used as it is, characters keep their positions
+            atlas = self.__load_bmfont_page(page_paths[0])
+            self.__texture = Image.fromarray(atlas)
+            texture_height, texture_width = atlas.shape[:2]
+        else:
+            self.__progress.console.log(
+                f"Merging {len(page_paths)} page(s) into single texture atlas..."
+            )
+
+            char_textures: dict[int, np.ndarray | None] = {}
+
+            for page, page_path in enumerate(page_paths):
+                atlas = self.__load_bmfont_page(page_path)
+
+                for char_id, char_data in chars.items():
+                    if (
+                        char_pages[char_id] == page
+                        and char_data.width != 0
+                        and char_data.height != 0
+                    ):
+                        char_textures[char_id] = self.__crop(
+                            atlas,
+                            char_data.x,
+                            char_data.y,
+                            char_data.width,
+                            char_data.height,
+                        )
+
+            texture_width, texture_height = self.__pack_character_textures(
+                chars, char_textures, padding
             )
-            for unknown_elem in unknowns_elem.findall("Unknown")
+
+        self.__chars = chars
+        self.__char_index_map = {char_id: char_id for char_id in chars}
+        self.__chars_path = None
+
+        self.__convert_characters(chars, texture_width, texture_height)
+
+        kernings = bmfont.kernings
+        kernings = kernings[
+            np.isin(kernings["first"], list(chars))
+            & np.isin(kernings["second"], list(chars))
         ]
 
-        self.__id_table = list(chars.keys())
-        __texture_size = font_data.find("Texture/Size")
+        self.__kernings = to_records(
+            [
+                Kerning(first, second, float(amount)).with_font_size(
+                    self.__font_size, self.__version
+                )
+                for first, second, amount in kernings.tolist()
+            ],
+            KERNING_DTYPE,
+        )
+        self.__unknowns = self.__quad_unknowns(len(chars))
+
+    @staticmethod
+    def __load_bmfont_page(page_path: Path) -> np.ndarray:
+        with Image.open(page_path) as page:
+            if page.mode != "L":
+                return np.asarray(page.convert("RGBA"))
+
+            # Single channel pages (8-bit output) hold glyphs as alpha
+            alpha = np.asarray(page)
+
+        atlas = np.zeros((*alpha.shape, 4), dtype=np.uint8)
+        atlas[..., :3] = np.where(alpha > 0, 255, 0)[..., None]
+        atlas[..., 3] = alpha
+
+        return atlas
+
+    def __convert_characters(
+        self, chars: dict[int, Character], texture_width: int, texture_height: int
+    ):
+        # Pixel-space characters to Remedy characters, advances and ID table
+        self.__texture_dimensions = (texture_width, texture_height)
+
+        self.__characters = to_records(
+            [
+                chars[char_id].to_remedy_character(
+                    char_id,
+                    texture_width,
+                    texture_height,
+                    self.__line_height,
+                    self.__font_size,
+                )
+                for char_id in chars.keys()
+            ],
+            CHARACTER_DTYPE,
+        )
 
-        if __texture_size is not None and __texture_size.text is not None:
-            self.__texture_size = int(__texture_size.text)
+        self.__advances = to_records(
+            [
+                Advance.calculate_values(
+                    char,
+                    idx,
+                    self.__font_size,
+                )
+                for idx, char in enumerate(chars.values())
+            ],
+            ADVANCE_DTYPE,
+        )
 
-        unknown_dds_header_elem = font_data.find("UnknownDDSHeader")
-        if (
-            unknown_dds_header_elem is not None
-            and unknown_dds_header_elem.text is not None
-        ):
-            self.__unknown_dds_header = int(unknown_dds_header_elem.text)
+        self.__id_table = list(chars.keys())
 
+    def load_texture(self, meta_path: Path):
         # Load the texture if it exists
         texture_path = meta_path.with_suffix(".png")
 
@@ -432,115 +1000,286 @@ class BinaryFont:
             self.__progress.console.log("Loading texture from PNG file...")
             self.__texture = Image.open(texture_path)
         else:
-            self.__progress.console.log("Creating empty texture atlas...")
-            self.__texture = Image.new(
-                "RGBA", (texture_width, texture_height), ATLAS_NULL_COLOR
+            self.__progress.console.log(
+                "Creating texture atlas from character files..."
             )
 
-            if not self.__texture:
-                raise ValueError("Failed to create empty texture atlas.")
+            self.__texture = Image.fromarray(
+                self.render_texture_region(0, 0, *self.__texture_dimensions)
+            )
 
-            chars_path = meta_path.parent / CHARS_FOLDER
+    @property
+    def character_layout(self) -> dict[str, tuple[int, int, int, int]]:
+        # Atlas rectangle of every compiled character bitmap, by file name
+        return {
+            f"{self.__char_index_map[char_id]}.png": (
+                char_data.x,
+                char_data.y,
+                char_data.width,
+                char_data.height,
+            )
+            for char_id, char_data in self.__chars.items()
+            if char_data.width != 0 and char_data.height != 0
+        }
+
+    def render_texture_region(
+        self, left: int, top: int, right: int, bottom: int
+    ) -> np.ndarray:
+        # Part of the atlas built from separate character files of compiled font
+        if self.__chars_path is None:
+            raise ValueError("Font was not compiled, no character files to render.")
+
+        region = np.empty((bottom - top, right - left, 4), dtype=np.uint8)
+        region[:] = ATLAS_NULL_COLOR
+
+        chars = {
+            char_id: char_data
+            for char_id, char_data in self.__chars.items()
+            if char_data.x < right
+            and char_data.x + char_data.width > left
+            and char_data.y < bottom
+            and char_data.y + char_data.height > top
+        }
+
+        # Characters are pasted in order (later overwrite overlapping ones)
+        for char_id, char_texture in self.__load_character_textures(
+            self.__chars_path, chars, self.__char_index_map
+        ).items():
+            if char_texture is not None:
+                self.__paste(
+                    region,
+                    char_texture,
+                    chars[char_id].x - left,
+                    chars[char_id].y - top,
+                )
 
-            self.__progress.console.log(
-                "Creating texture atlas from character files..."
+        return region
+
+    def __subset_unknowns(self, unknowns: np.ndarray, kept: np.ndarray) -> np.ndarray:
+        if len(unknowns) != len(kept):
+            raise ValueError(
+                f"Font has {len(unknowns)} unknowns for {len(kept)} characters, cannot subset it."
             )
-            for idx, char_data in enumerate(chars.values()):
-                # Use index from XML to get character to load
-                char_idx = char_index_map[self.__id_table[idx]]
-                char_path = chars_path / f"{char_idx}.png"
 
-                if char_data.width == 0 or char_data.height == 0:
-                    continue
+        # Unknowns are usually vertex indices of character quads, those are
+        # renumbered for the remaining characters
+        if np.array_equal(unknowns, self.__quad_unknowns(len(unknowns))):
+            return self.__quad_unknowns(int(kept.sum()))
 
-                if char_path.exists():
-                    char_texture = Image.open(char_path)
-                    self.__texture.paste(
-                        char_texture,
-                        (
-                            char_data.x,
-                            char_data.y,
-                            char_data.x + char_data.width,
-                            char_data.y + char_data.height,
-                        ),
-                    )
-                else:
-                    self.__progress.console.log(
-                        f"Warning: Character texture file not found: {char_path}"
+        self.__progress.console.log(
+            "Warning: Unknowns do not follow the usual pattern, keeping them as they are."
+        )
+        return unknowns[kept]
+
+    @staticmethod
+    def __quad_unknowns(count: int) -> np.ndarray:
+        # Vertex indices of two triangles per character quad
+        quad = np.array([0, 1, 2, 0, 2, 3])
+
+        return unstructured_to_structured(
+            (np.arange(count)[:, None] * 4 + quad).astype("<u2"), dtype=UNKNOWN_DTYPE
+        )
+
+    def __load_character_textures(
+        self,
+        chars_path: Path,
+        chars: dict[int, Character],
+        char_index_map: dict[int, int],
+    ) -> dict[int, np.ndarray | None]:
+        def load_character(char_path: Path, char_data: Character):
+            if not char_path.exists():
+                return None
+
+            with Image.open(char_path) as char_texture:
+                if char_texture.size != (char_data.width, char_data.height):
+                    raise ValueError(
+                        f"Character texture {char_path} is {char_texture.width}x{char_texture.height}, "
+                        f"expected {char_data.width}x{char_data.height}."
                     )
 
-    def save(self, output_path: Path):
+                return np.asarray(char_texture.convert("RGBA"))
+
+        # Use index from XML to get character to load
+        characters = [
+            (char_id, chars_path / f"{char_index_map[char_id]}.png", char_data)
+            for char_id, char_data in chars.items()
+            if char_data.width != 0 and char_data.height != 0
+        ]
+
+        # PNG decoding releases the GIL, so characters are loaded concurrently
+        with ThreadPoolExecutor() as executor:
+            char_textures = dict(
+                zip(
+                    (char_id for char_id, _, _ in characters),
+                    executor.map(
+                        lambda character: load_character(*character[1:]), characters
+                    ),
+                )
+            )
+
+        for char_id, char_path, _ in characters:
+            if char_textures[char_id] is None:
+                self.__progress.console.log(
+                    f"Warning: Character texture file not found: {char_path}"
+                )
+
+        return char_textures
+
+    def __repack_texture(
+        self,
+        meta_path: Path,
+        chars: dict[int, Character],
+        char_index_map: dict[int, int],
+        separate_characters: bool,
+        padding: int,
+    ) -> tuple[int, int]:
+        if separate_characters:
+            char_textures = self.__load_character_textures(
+                meta_path.parent / CHARS_FOLDER, chars, char_index_map
+            )
+        else:
+            with Image.open(meta_path.with_suffix(".png")) as texture:
+                atlas = np.asarray(texture.convert("RGBA"))
+
+            char_textures = {
+                char_id: self.__crop(
+                    atlas, char_data.x, char_data.y, char_data.width, char_data.height
+                )
+                for char_id, char_data in chars.items()
+                if char_data.width != 0 and char_data.height != 0
+            }
+
+        return self.__pack_character_textures(chars, char_textures, padding)
+
+    def __pack_character_textures(
+        self,
+        chars: dict[int, Character],
+        char_textures: dict[int, np.ndarray | None],
+        padding: int,
+    ) -> tuple[int, int]:
+        # Byte-identical bitmaps share single region of the atlas
+        regions: dict[tuple, int] = {}
+        region_textures: list[np.ndarray] = []
+        char_regions: dict[int, int] = {}
+
+        for char_id, char_texture in char_textures.items():
+            if char_texture is None:
+                # Keep the space of missing bitmap, same as the original atlas
+                char_texture = np.empty(
+                    (chars[char_id].height, chars[char_id].width, 4), dtype=np.uint8
+                )
+                char_texture[:] = ATLAS_NULL_COLOR
+
+            key = (char_texture.shape, char_texture.tobytes())
+
+            if key not in regions:
+                regions[key] = len(region_textures)
+                region_textures.append(char_texture)
+
+            char_regions[char_id] = regions[key]
+
+        self.__progress.console.log(
+            f"Packing {len(region_textures)} unique characters "
+            f"({len(char_regions) - len(region_textures)} duplicates merged)..."
+        )
+
+        texture_width, texture_height, positions = pack_rectangles(
+            [(texture.shape[1], texture.shape[0]) for texture in region_textures],
+            padding,
+        )
+
+        # Padding has to be fully transparent, so it reads as outside of glyph
+        atlas = np.zeros((texture_height, texture_width, 4), dtype=np.uint8)
+
+        for (x, y), char_texture in zip(positions, region_textures):
+            self.__paste(atlas, char_texture, x, y)
+
+        for char_id, region in char_regions.items():
+            chars[char_id].x, chars[char_id].y = positions[region]
+
+        self.__texture = Image.fromarray(atlas)
+
+        return texture_width, texture_height
+
+    def encode_texture(self) -> bytes:
+        if self.__texture is None and self.__texture_source is not None:
+            # Texture was never decoded, so it's written back unchanged
+            return self.__read_texture_data()
+
         if not self.__texture:
             raise ValueError("Texture is not loaded. Cannot compile.")
 
+        if self.__version == FontVersion.QUANTUM_BREAK:
+            self.__progress.console.log("Converting texture to R16_FLOAT format...")
+            return DDS.image_to_r16f(self.__texture)
+
         self.__progress.console.log("Converting texture to DDS format...")
 
         texture_data = BytesIO()
         self.__texture.save(texture_data, format="DDS")
-        texture_bytes = texture_data.getvalue()
+        return texture_data.getvalue()
 
-        if self.__version == FontVersion.QUANTUM_BREAK:
-            self.__progress.console.log("Converting texture to R16_FLOAT format...")
-            texture_bytes = DDS.convert_to_r16f(texture_bytes)
+    def serialize_tables(self) -> bytes:
+        # Everything before the texture block
+        writer = BytesIO()
+        writer.write(self.__version.value.to_bytes(4, "little"))
+
+        self.__write_character_block(writer)
+        self.__write_unknown_block(writer)
+        self.__write_advance_block(writer)
+        self.__write_id_table(writer)
+        self.__write_kerning_block(writer)
+
+        return writer.getvalue()
+
+    def serialize_texture_header(self, texture_bytes: bytes) -> bytes:
+        if self.__version in [FontVersion.ALAN_WAKE, FontVersion.ALAN_WAKE_REMASTERED]:
+            return len(texture_bytes).to_bytes(4, "little")
+        elif self.__version == FontVersion.QUANTUM_BREAK:
+            return (self.__unknown_dds_header or 0).to_bytes(8, "little")
+
+        return b""
+
+    def save(self, output_path: Path):
+        texture_bytes = self.encode_texture()
 
         self.__progress.console.log("Writing font to file...")
         with output_path.open("wb") as writer:
-            writer.write(self.__version.value.to_bytes(4, "little"))
-
-            self.__write_character_block(writer)
-            self.__write_unknown_block(writer)
-            self.__write_advance_block(writer)
-            self.__write_id_table(writer)
-            self.__write_kerning_block(writer)
-            self.__write_texture(writer, texture_bytes)
+            writer.write(self.serialize_tables())
+            writer.write(self.serialize_texture_header(texture_bytes))
+            writer.write(texture_bytes)
 
     def __write_character_block(self, writer):
         writer.write((len(self.__characters) * 4).to_bytes(4, "little"))
-
-        for char in self.__characters:
-            writer.write(pack("16f", *asdict(char).values()))
+        writer.write(self.__characters.astype(CHARACTER_DTYPE, copy=False).tobytes())
 
     def __write_unknown_block(self, writer):
         writer.write((len(self.__unknowns) * 6).to_bytes(4, "little"))
-
-        for unk in self.__unknowns:
-            writer.write(pack("6H", *asdict(unk).values()))
+        writer.write(self.__unknowns.astype(UNKNOWN_DTYPE, copy=False).tobytes())
 
     def __write_advance_block(self, writer):
         writer.write((len(self.__advances)).to_bytes(4, "little"))
-
-        for adv in self.__advances:
-            writer.write(pack("4HI8f", *asdict(adv).values()))
+        writer.write(self.__advances.astype(ADVANCE_DTYPE, copy=False).tobytes())
 
     def __write_id_table(self, writer):
-        id_table = np.zeros(0xFFFF + 1, dtype=np.uint16)
-        base_id = 0
+        id_table = np.zeros(0xFFFF + 1, dtype="<u2")
+        id_table[self.__id_table] = np.arange(len(self.__id_table))
 
-        for idx in self.__id_table:
-            id_table[int(idx)] = base_id
-            base_id += 1
-
-        for idx in id_table.tolist():
-            writer.write(idx.to_bytes(2, "little"))
+        writer.write(id_table.tobytes())
 
     def __write_kerning_block(self, writer):
         writer.write(len(self.__kernings).to_bytes(4, "little"))
 
-        match self.__version:
-            case FontVersion.ALAN_WAKE_REMASTERED:
-                fmt = "2Ii"
-            case FontVersion.QUANTUM_BREAK:
-                fmt = "2Hf"
-            case _:
-                return
+        if self.__version not in KERNING_DTYPES:
+            return
 
-        for ker in self.__kernings:
-            writer.write(pack(fmt, *asdict(ker).values()))
+        writer.write(self.__convert_kernings(KERNING_DTYPES[self.__version]).tobytes())
 
-    def __write_texture(self, writer, texture_bytes):
-        if self.__version in [FontVersion.ALAN_WAKE, FontVersion.ALAN_WAKE_REMASTERED]:
-            writer.write(len(texture_bytes).to_bytes(4, "little"))
-        elif self.__version == FontVersion.QUANTUM_BREAK:
-            writer.write((self.__unknown_dds_header or 0).to_bytes(8, "little"))
+    def __convert_kernings(self, dtype: np.dtype) -> np.ndarray:
+        kernings = self.__kernings.copy()
+
+        if dtype["amount"].kind in "iu":
+            # Amounts scaled by font size are rounded, not truncated
+            kernings["amount"] = np.rint(kernings["amount"])
 
-        writer.write(texture_bytes)
+        return kernings.astype(dtype)
@@ -0,0 +1,24 @@
+from pathlib import Path
+
+from northlighttools.binfnt.enumerators.character_set import CharacterSet
+from northlighttools.string_table.string_table import StringTable
+
+
+def get_baseline_codepoints(character_set: CharacterSet) -> set[int]:
+    match character_set:
+        case CharacterSet.NONE:
+            return set()
+        case CharacterSet.ASCII:
+            return set(range(0x80))
+        case CharacterSet.LATIN1:
+            return set(range(0x100))
+
+
+def get_used_codepoints(string_tables: list[Path]) -> set[int]:
+    codepoints = set()
+
+    for string_table_path in string_tables:
+        for value in StringTable(string_table_path).entries.values():
+            codepoints.update(map(ord, set(value)))
+
+    return codepoints
@@ -0,0 +1,132 @@
+class SkylinePacker:
+    """
+    Rectangle bin packer using the skyline bottom-left heuristic.
+
+    The skyline is kept as a list of [x, y, width] segments describing the top
+    edge of already placed rectangles, new rectangles are put where their top
+    edge ends up lowest (ties broken by leftmost position).
+    """
+
+    def __init__(self, width: int, height: int):
+        self.__width = width
+        self.__height = height
+        self.__skyline = [[0, 0, width]]
+
+    def __fit(self, idx: int, width: int, height: int) -> int | None:
+        x = self.__skyline[idx][0]
+
+        if x + width > self.__width:
+            return None
+
+        y, remaining = 0, width
+
+        while remaining > 0:
+            if idx >= len(self.__skyline):
+                return None
+
+            y = max(y, self.__skyline[idx][1])
+
+            if y + height > self.__height:
+                return None
+
+            remaining -= self.__skyline[idx][2]
+            idx += 1
+
+        return y
+
+    def insert(self, width: int, height: int) -> tuple[int, int] | None:
+        best = None
+
+        for idx, (x, _, _) in enumerate(self.__skyline):
+            y = self.__fit(idx, width, height)
+
+            if y is not None and (best is None or (y + height, x) < best[0]):
+                best = ((y + height, x), idx, x, y)
+
+        if best is None:
+            return None
+
+        _, idx, x, y = best
+        self.__skyline.insert(idx, [x, y + height, width])
+
+        # Shrink or remove segments now covered by the new one
+        idx += 1
+        while idx < len(self.__skyline):
+            segment = self.__skyline[idx]
+            overlap = x + width - segment[0]
+
+            if overlap <= 0:
+                break
+
+            if overlap < segment[2]:
+                segment[0] += overlap
+                segment[2] -= overlap
+                break
+
+            del self.__skyline[idx]
+
+        # Merge neighbouring segments of the same height
+        idx = 0
+        while idx < len(self.__skyline) - 1:
+            if self.__skyline[idx][1] == self.__skyline[idx + 1][1]:
+                self.__skyline[idx][2] += self.__skyline[idx + 1][2]
+                del self.__skyline[idx + 1]
+            else:
+                idx += 1
+
+        return x, y
+
+
+def pack_rectangles(
+    sizes: list[tuple[int, int]], padding: int = 0, max_size: int = 16384
+) -> tuple[int, int, list[tuple[int, int]]]:
+    """
+    Packs rectangles of given (width, height) sizes into the smallest
+    power-of-two sized atlas.
+
+    Returns atlas width, atlas height and (x, y) position of every rectangle.
+    """
+    padded = [(width + padding, height + padding) for width, height in sizes]
+
+    # Taller (then wider) rectangles first, packs much tighter with skylines
+    order = sorted(
+        range(len(padded)), key=lambda idx: (-padded[idx][1], -padded[idx][0])
+    )
+
+    area = sum(width * height for width, height in padded)
+    min_width = max((width for width, _ in padded), default=1)
+    min_height = max((height for _, height in padded), default=1)
+
+    powers = [
+        1 << exponent
+        for exponent in range(max_size.bit_length())
+        if 1 << exponent <= max_size
+    ]
+    candidates = sorted(
+        (
+            (width, height)
+            for width in powers
+            for height in powers
+            if width * height >= area
+            and width >= min_width
+            and height >= min_height
+            and height <= width <= height * 2
+        ),
+        key=lambda size: (size[0] * size[1], size[0]),
+    )
+
+    for atlas_width, atlas_height in candidates:
+        packer = SkylinePacker(atlas_width, atlas_height)
+        positions: list[tuple[int, int]] = [(0, 0)] * len(padded)
+
+        for idx in order:
+            position = packer.insert(*padded[idx])
+
+            if position is None:
+                break
+
+            positions[idx] = position
+        else:
+            return atlas_width, atlas_height, positions
+
+    raise ValueError(f"Characters do not fit into {max_size}x{max_size} texture atlas.")
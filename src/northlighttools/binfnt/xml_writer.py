@@ -0,0 +1,81 @@
+from typing import TextIO
+
+
+def escape_attrib(text: str) -> str:
+    # Same escaping as ElementTree uses for attribute values
+    for char, entity in (
+        ("&", "&amp;"),
+        ("<", "&lt;"),
+        (">", "&gt;"),
+        ('"', "&quot;"),
+        ("\r", "&#13;"),
+        ("\n", "&#10;"),
+        ("\t", "&#09;"),
+    ):
+        if char in text:
+            text = text.replace(char, entity)
+
+    return text
+
+
+def escape_cdata(text: str) -> str:
+    for char, entity in (("&", "&amp;"), ("<", "&lt;"), (">", "&gt;")):
+        if char in text:
+            text = text.replace(char, entity)
+
+    return text
+
+
+class XMLWriter:
+    """
+    Incremental XML writer, elements are written as soon as they are started.
+
+    Output is the same as of ElementTree.write (with XML declaration) after
+    ET.indent, but the document tree is never built in memory.
+    """
+
+    def __init__(self, writer: TextIO):
+        self.__writer = writer
+        self.__open_tags: list[str] = []
+        # Start tag of the current element is not finished yet (it's written
+        # as self-closing tag if the element ends without children)
+        self.__pending = False
+
+        writer.write("<?xml version='1.0' encoding='utf-8'?>\n")
+
+    def start(self, tag: str, **attrib: str):
+        if self.__pending:
+            self.__writer.write(">")
+
+        if self.__open_tags:
+            self.__writer.write("\n" + "  " * len(self.__open_tags))
+
+        self.__writer.write(
+            f"<{tag}"
+            + "".join(
+                f' {key}="{escape_attrib(value)}"' for key, value in attrib.items()
+            )
+        )
+
+        self.__open_tags.append(tag)
+        self.__pending = True
+
+    def end(self):
+        tag = self.__open_tags.pop()
+
+        if self.__pending:
+            self.__writer.write(" />")
+            self.__pending = False
+        else:
+            self.__writer.write("\n" + "  " * len(self.__open_tags) + f"</{tag}>")
+
+    def element(self, tag: str, text: str | None = None, **attrib: str):
+        self.start(tag, **attrib)
+
+        if not text:
+            self.end()
+            return
+
+        self.__writer.write(f">{escape_cdata(text)}</{tag}>")
+        self.__open_tags.pop()
+        self.__pending = False
@@ -1,7 +1,12 @@
+import json
+import re
+from contextlib import ExitStack
+from fnmatch import fnmatch
 from pathlib import Path
 from typing import Annotated
 
 import humanize
+import numpy as np
 import typer
 from rich import print
 from rich.console import Console
@@ -18,12 +23,17 @@ from rich.progress import (
 from rich.table import Table
 
 from northlighttools.rmdp.enumerators.endianness import Endianness, EndiannessChoice
+from northlighttools.rmdp.enumerators.manifest_format import ManifestFormat
 from northlighttools.rmdp.enumerators.package_version import (
     PackageVersion,
     PackageVersionChoice,
 )
+from northlighttools.rmdp.enumerators.text_encoding import TextEncoding
 from northlighttools.rmdp.helpers import get_archive_paths
+from northlighttools.rmdp.manifest import ExtractionManifest
 from northlighttools.rmdp.package import Package
+from northlighttools.rmdp.package_set import PackageSet
+from northlighttools.rmdp.search import compile_pattern
 
 app = typer.Typer(help="Tools for Remedy Packages (.bin/.rmdp files)")
 
@@ -106,6 +116,335 @@ def contents(
     console.print(table)
 
 
+@app.command(help="Prints total size of folders in a Remedy Package")
+def du(
+    archive_path: Annotated[
+        Path,
+        typer.Argument(
+            help="Path to the input .bin/.rmdp file",
+            exists=True,
+            file_okay=True,
+            dir_okay=False,
+            readable=True,
+        ),
+    ],
+    top: Annotated[
+        int,
+        typer.Option(
+            "--top",
+            "-n",
+            min=1,
+            help="Number of heaviest folders to print",
+        ),
+    ] = 20,
+    max_depth: Annotated[
+        int | None,
+        typer.Option(
+            "--max-depth",
+            "-d",
+            min=0,
+            help="Only consider folders up to this depth (root folder is 0)",
+        ),
+    ] = None,
+    as_json: Annotated[
+        bool,
+        typer.Option(
+            "--json",
+            is_flag=True,
+            help="Print machine-readable JSON instead of a table",
+        ),
+    ] = False,
+):
+    bin_path, _ = get_archive_paths(archive_path)
+
+    with Progress(transient=True) as progress:
+        progress.add_task(
+            description="Reading package metadata...",
+            total=None,
+        )
+        package = Package(header_path=bin_path)
+
+    sizes, counts, depths = package.get_folder_totals()
+
+    candidates = np.arange(len(package.folders))
+
+    if max_depth is not None:
+        candidates = candidates[depths <= max_depth]
+
+    heaviest = candidates[np.argsort(-sizes[candidates], kind="stable")][:top]
+
+    rows = [
+        {
+            "path": package.get_folder_path(package.folders[idx]).as_posix(),
+            "depth": int(depths[idx]),
+            "size": int(sizes[idx]),
+            "files": int(counts[idx]),
+        }
+        for idx in heaviest
+    ]
+
+    if as_json:
+        typer.echo(json.dumps(rows, indent=2))
+        return
+
+    total_size = int(sizes[depths == 0].sum())
+    table = Table("Folder", "Size", "Files", "Share")
+
+    for row in rows:
+        table.add_row(
+            row["path"],
+            humanize.naturalsize(row["size"]),
+            str(row["files"]),
+            f"{row['size'] / total_size:.1%}" if total_size else "-",
+        )
+
+    Console().print(table)
+
+
+@app.command(help="Indexes all Remedy Packages in a game directory")
+def index(
+    game_dir: Annotated[
+        Path,
+        typer.Argument(
+            help="Path to the game directory containing .bin/.rmdp files",
+            exists=True,
+            file_okay=False,
+            dir_okay=True,
+            readable=True,
+        ),
+    ],
+    index_path: Annotated[
+        Path | None,
+        typer.Option(
+            "--index-file",
+            "-f",
+            help="Path to the index file (default: rmdp_index.json in game directory)",
+            file_okay=True,
+            dir_okay=False,
+        ),
+    ] = None,
+    priority: Annotated[
+        list[str] | None,
+        typer.Option(
+            "--priority",
+            "-p",
+            help="Glob pattern of archives that should win over others, can be repeated (first wins)",
+        ),
+    ] = None,
+    lookup: Annotated[
+        list[str] | None,
+        typer.Option(
+            "--lookup",
+            "-l",
+            help="Print all archives containing the given package path",
+        ),
+    ] = None,
+    list_files: Annotated[
+        bool,
+        typer.Option(
+            "--list",
+            is_flag=True,
+            help="List all package paths with the archive that provides them",
+        ),
+    ] = False,
+    rebuild: Annotated[
+        bool,
+        typer.Option(
+            "--rebuild",
+            is_flag=True,
+            help="Rebuild index even if it is up to date",
+        ),
+    ] = False,
+    jobs: Annotated[
+        int | None,
+        typer.Option(
+            "--jobs",
+            "-j",
+            min=1,
+            help="Number of worker processes (default: number of CPUs)",
+        ),
+    ] = None,
+):
+    index_path = index_path or game_dir / "rmdp_index.json"
+    archive_paths = PackageSet.find_archives(game_dir, priority)
+
+    if not archive_paths:
+        raise typer.BadParameter(f"No Remedy Packages found in {game_dir}")
+
+    package_set = None
+
+    if index_path.exists() and not rebuild:
+        try:
+            package_set = PackageSet.load(index_path)
+        except ValueError as e:
+            # Index from older version or damaged file is rebuilt like stale one
+            print(f"[yellow]{e}, rebuilding index...[/yellow]")
+
+        if package_set is not None and not package_set.is_up_to_date(
+            archive_paths, index_path
+        ):
+            package_set = None
+
+    if package_set is None:
+        with Progress(transient=True) as progress:
+            progress.add_task(
+                description=f"Indexing {len(archive_paths)} package(s)...",
+                total=None,
+            )
+            package_set = PackageSet(archive_paths, max_workers=jobs)
+            package_set.save(index_path)
+
+    console = Console()
+
+    for path in lookup or []:
+        entries = package_set.lookup(path)
+
+        if not entries:
+            print(f"{path}: [red]not found[/red]")
+            continue
+
+        table = Table("Archive", "Size", "Offset", "CRC32", title=entries[0].path)
+
+        for idx, entry in enumerate(entries):
+            table.add_row(
+                str(entry.archive_path.relative_to(game_dir.resolve()))
+                + (" (active)" if idx == 0 else ""),
+                humanize.naturalsize(entry.size),
+                hex(entry.offset),
+                f"{entry.data_checksum:08x}",
+            )
+
+        console.print(table)
+
+    if list_files:
+        for entry in package_set:
+            typer.echo(
+                f"{entry.path}\t{entry.archive_path.relative_to(game_dir.resolve())}"
+            )
+
+    if not lookup and not list_files:
+        print(f"Packages: {len(package_set.archives)}")
+        print(f"Unique files: {len(package_set)}")
+        print(
+            f"Files present in more than one package: {sum(1 for _ in package_set.get_overridden())}"
+        )
+        print(f"Index file: {index_path}")
+
+
+@app.command(help="Searches file contents of a Remedy Package without extracting")
+def grep(
+    archive_path: Annotated[
+        Path,
+        typer.Argument(
+            help="Path to the input .bin/.rmdp file",
+            exists=True,
+            file_okay=True,
+            dir_okay=False,
+            readable=True,
+        ),
+    ],
+    pattern: Annotated[
+        str,
+        typer.Argument(help="Text (or regular expression with --regex) to search for"),
+    ],
+    regex: Annotated[
+        bool,
+        typer.Option(
+            "--regex",
+            "-r",
+            is_flag=True,
+            help="Treat pattern as a regular expression matched against raw bytes",
+        ),
+    ] = False,
+    ignore_case: Annotated[
+        bool,
+        typer.Option(
+            "--ignore-case",
+            "-i",
+            is_flag=True,
+            help="Ignore case of ASCII letters when matching",
+        ),
+    ] = False,
+    encodings: Annotated[
+        list[TextEncoding] | None,
+        typer.Option(
+            "--encoding",
+            "-e",
+            help="Encoding(s) of the searched text (default: all), ignored with --regex",
+            case_sensitive=False,
+        ),
+    ] = None,
+    include: Annotated[
+        list[str] | None,
+        typer.Option(
+            "--include",
+            "-I",
+            help="Only search files whose package path matches the glob pattern",
+        ),
+    ] = None,
+    jobs: Annotated[
+        int | None,
+        typer.Option(
+            "--jobs",
+            "-j",
+            min=1,
+            help="Number of worker processes (default: number of CPUs)",
+        ),
+    ] = None,
+):
+    bin_path, rmdp_path = get_archive_paths(archive_path)
+
+    try:
+        search_pattern = compile_pattern(
+            pattern, encodings or list(TextEncoding), regex, ignore_case
+        )
+    except re.error as e:
+        raise typer.BadParameter(f"Invalid regular expression: {e}")
+
+    # Otherwise every offset of every file would be reported
+    if search_pattern.fullmatch(b""):
+        raise typer.BadParameter("Search pattern must not match empty text")
+
+    with Progress(transient=True) as progress:
+        progress.add_task(
+            description="Reading package metadata...",
+            total=None,
+        )
+        package = Package(header_path=bin_path)
+
+    files = package.files
+
+    if include:
+        files = [
+            file
+            for file in files
+            if any(
+                fnmatch(package.get_file_path(file).as_posix(), glob)
+                for glob in include
+            )
+        ]
+
+    matches = 0
+
+    with Progress(transient=True) as progress:
+        progress.add_task(
+            description=f"Searching {len(files)} file(s)...",
+            total=None,
+        )
+
+        for file, offset in package.search(
+            rmdp_path, search_pattern, files, max_workers=jobs
+        ):
+            progress.console.print(
+                f"{package.get_file_path(file).as_posix()}: {hex(offset)}",
+                markup=False,
+                highlight=False,
+            )
+            matches += 1
+
+    print(f"Found {matches} match(es)")
+
+
 @app.command(help="Extracts a Remedy Package")
 def extract(
     archive_path: Annotated[
@@ -127,6 +466,25 @@ def extract(
             writable=True,
         ),
     ] = None,
+    manifest_path: Annotated[
+        Path | None,
+        typer.Option(
+            "--manifest",
+            "-m",
+            help="Write manifest of extracted files (path, size, offset, CRC32, write time) to this file",
+            file_okay=True,
+            dir_okay=False,
+            writable=True,
+        ),
+    ] = None,
+    manifest_format: Annotated[
+        ManifestFormat,
+        typer.Option(
+            "--manifest-format",
+            help="Format of the manifest file",
+            case_sensitive=False,
+        ),
+    ] = ManifestFormat.JSONL,
 ):
     bin_path, rmdp_path = get_archive_paths(archive_path)
 
@@ -149,7 +507,13 @@ def extract(
         TimeElapsedColumn(),
         TimeRemainingColumn(),
     ) as progress:
-        with rmdp_path.open("rb") as f:
+        with rmdp_path.open("rb") as f, ExitStack() as stack:
+            manifest = (
+                stack.enter_context(ExtractionManifest(manifest_path, manifest_format))
+                if manifest_path
+                else None
+            )
+
             for file in progress.track(
                 package.files,
                 description="Extracting files...",
@@ -159,7 +523,10 @@ def extract(
 
                 progress.console.log(f"Extracting {file_path}...")
 
-                package.extract(f, file, output_path)
+                checksum = package.extract(f, file, output_path)
+
+                if manifest:
+                    manifest.add(file_path, file, checksum)
 
 
 @app.command(help="Pack directory into a Remedy Package")
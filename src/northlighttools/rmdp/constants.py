@@ -2,3 +2,4 @@ EPOCH_AS_FILETIME = 116444736000000000  # January 1, 1970 as MS file time
 HUNDREDS_OF_NANOSECONDS = 10000000
 
 CHUNK_SIZE = 1024 * 1024  # 1 MiB, chunk size for reading/writing files
+SEARCH_BATCH_SIZE = 16 * 1024 * 1024  # 16 MiB, amount of data scanned per search task
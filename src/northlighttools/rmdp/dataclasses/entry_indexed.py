@@ -0,0 +1,12 @@
+from dataclasses import dataclass
+from pathlib import Path
+
+
+@dataclass
+class IndexEntry:
+    path: str
+    archive_path: Path
+    file_index: int
+    offset: int
+    size: int
+    data_checksum: int
@@ -0,0 +1,11 @@
+from dataclasses import dataclass
+from datetime import datetime
+
+
+@dataclass
+class ManifestEntry:
+    path: str
+    size: int
+    offset: int
+    checksum: int
+    write_time: datetime | None = None
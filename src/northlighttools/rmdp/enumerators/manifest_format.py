@@ -0,0 +1,6 @@
+from enum import Enum
+
+
+class ManifestFormat(str, Enum):
+    JSONL = "jsonl"
+    BINARY = "binary"
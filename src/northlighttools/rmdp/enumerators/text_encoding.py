@@ -0,0 +1,6 @@
+from enum import Enum
+
+
+class TextEncoding(str, Enum):
+    UTF8 = "utf-8"
+    UTF16LE = "utf-16le"
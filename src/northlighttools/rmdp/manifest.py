@@ -0,0 +1,122 @@
+import json
+from collections.abc import Iterator
+from datetime import datetime
+from pathlib import Path
+from struct import Struct
+
+from northlighttools.rmdp.dataclasses.entry_file import FileEntry
+from northlighttools.rmdp.dataclasses.entry_manifest import ManifestEntry
+from northlighttools.rmdp.enumerators.manifest_format import ManifestFormat
+from northlighttools.rmdp.helpers import dt_to_filetime, filetime_to_dt
+
+BINARY_MAGIC = b"RMDM"
+BINARY_VERSION = 1
+
+# size, offset, crc32, write time (FILETIME, 0 if unknown), path length
+BINARY_RECORD = Struct("<QQIQH")
+
+
+class ExtractionManifest:
+    """
+    Record of files extracted from a Remedy Package.
+
+    Entries are written as soon as they are added, so the manifest of an
+    interrupted extraction still describes all files written so far.
+    """
+
+    def __init__(self, manifest_path: Path, manifest_format: ManifestFormat):
+        self.__format = manifest_format
+
+        if manifest_format == ManifestFormat.BINARY:
+            self.__file = manifest_path.open("wb")
+            self.__file.write(BINARY_MAGIC)
+            self.__file.write(BINARY_VERSION.to_bytes(4, "little"))
+        else:
+            self.__file = manifest_path.open("w", encoding="utf-8")
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *_):
+        self.close()
+
+    def close(self):
+        self.__file.close()
+
+    def add(self, package_path: Path, file: FileEntry, checksum: int):
+        path = package_path.as_posix()
+
+        if self.__format == ManifestFormat.BINARY:
+            encoded_path = path.encode("utf-8")
+
+            self.__file.write(
+                BINARY_RECORD.pack(
+                    file.size,
+                    file.offset,
+                    checksum,
+                    dt_to_filetime(file.write_time) if file.write_time else 0,
+                    len(encoded_path),
+                )
+            )
+            self.__file.write(encoded_path)
+            return
+
+        entry = {
+            "path": path,
+            "size": file.size,
+            "offset": file.offset,
+            "crc32": checksum,
+            "write_time": file.write_time.isoformat() if file.write_time else None,
+        }
+
+        self.__file.write(
+            json.dumps(entry, ensure_ascii=False, separators=(",", ":")) + "\n"
+        )
+
+    @staticmethod
+    def read(manifest_path: Path) -> Iterator[ManifestEntry]:
+        with manifest_path.open("rb") as f:
+            if f.read(len(BINARY_MAGIC)) != BINARY_MAGIC:
+                f.seek(0)
+
+                for line in f:
+                    if not line.strip():
+                        continue
+
+                    entry = json.loads(line)
+                    write_time = entry.get("write_time")
+
+                    yield ManifestEntry(
+                        path=entry["path"],
+                        size=entry["size"],
+                        offset=entry["offset"],
+                        checksum=entry["crc32"],
+                        write_time=(
+                            datetime.fromisoformat(write_time) if write_time else None
+                        ),
+                    )
+
+                return
+
+            version = int.from_bytes(f.read(4), "little")
+
+            if version != BINARY_VERSION:
+                raise ValueError(
+                    f"Unsupported manifest version {version} in {manifest_path}"
+                )
+
+            while record := f.read(BINARY_RECORD.size):
+                if len(record) != BINARY_RECORD.size:
+                    raise ValueError(f"Manifest {manifest_path} is truncated.")
+
+                size, offset, checksum, filetime, path_len = BINARY_RECORD.unpack(
+                    record
+                )
+
+                yield ManifestEntry(
+                    path=f.read(path_len).decode("utf-8"),
+                    size=size,
+                    offset=offset,
+                    checksum=checksum,
+                    write_time=filetime_to_dt(filetime) if filetime else None,
+                )
@@ -1,11 +1,19 @@
+import mmap
 import os
+import re
 import zlib
+from collections.abc import Iterator
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
 from datetime import datetime, timezone
 from io import BufferedReader, BufferedWriter
 from pathlib import Path
 from typing import Literal
 
-from northlighttools.rmdp.constants import CHUNK_SIZE
+import numpy as np
+
+from northlighttools.rmdp import search
+from northlighttools.rmdp.constants import CHUNK_SIZE, SEARCH_BATCH_SIZE
 from northlighttools.rmdp.dataclasses.entry_file import FileEntry
 from northlighttools.rmdp.dataclasses.entry_folder import FolderEntry
 from northlighttools.rmdp.enumerators.endianness import Endianness
@@ -214,7 +222,68 @@ class Package:
         parent_folder = self.folders[file.parent_folder_id]
         return Path(self.get_folder_path(parent_folder), file.name)
 
-    def extract(self, reader: BufferedReader, file: FileEntry, output_path: Path):
+    def get_folder_totals(self) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        # Returns recursive total size, recursive file count and depth of every
+        # folder (indexed like self.folders), computed bottom-up over parent ids
+        folder_count = len(self.__folders)
+
+        parents = np.fromiter(
+            (
+                (
+                    folder.parent_folder_id
+                    if folder.parent_folder_id < folder_count
+                    else -1
+                )
+                for folder in self.__folders
+            ),
+            dtype=np.int64,
+            count=folder_count,
+        )
+        file_parents = np.fromiter(
+            (file.parent_folder_id for file in self.__files),
+            dtype=np.int64,
+            count=len(self.__files),
+        )
+        file_sizes = np.fromiter(
+            (file.size for file in self.__files),
+            dtype=np.int64,
+            count=len(self.__files),
+        )
+
+        sizes = np.zeros(folder_count, dtype=np.int64)
+        counts = np.zeros(folder_count, dtype=np.int64)
+
+        np.add.at(sizes, file_parents, file_sizes)
+        np.add.at(counts, file_parents, 1)
+
+        depths = np.zeros(folder_count, dtype=np.int64)
+        ancestors = parents.copy()
+
+        for _ in range(folder_count + 1):
+            has_parent = ancestors >= 0
+
+            if not has_parent.any():
+                break
+
+            depths[has_parent] += 1
+            ancestors[has_parent] = parents[ancestors[has_parent]]
+        else:
+            raise ValueError(
+                "Folder hierarchy contains a cycle. Package may be corrupted."
+            )
+
+        # Fold each level into its parents, starting from the deepest one
+        for depth in range(int(depths.max(initial=0)), 0, -1):
+            level = depths == depth
+
+            np.add.at(sizes, parents[level], sizes[level])
+            np.add.at(counts, parents[level], counts[level])
+
+        return sizes, counts, depths
+
+    def extract(
+        self, reader: BufferedReader, file: FileEntry, output_path: Path
+    ) -> int:
         output_path.parent.mkdir(parents=True, exist_ok=True)
         reader.seek(file.offset)
 
@@ -241,6 +310,141 @@ class Package:
             ts = file.write_time.timestamp()
             os.utime(output_path, (ts, ts))
 
+        return actual_checksum
+
+    @classmethod
+    @contextmanager
+    def open_archive(
+        cls, archive_path: Path
+    ) -> Iterator[Iterator[tuple[Path, FileEntry, memoryview]]]:
+        """
+        Opens a Remedy Package for in-process reading.
+
+        Yields an iterator of (package path, file entry, file data) tuples in the
+        order files are stored in the .rmdp file. File data is a read-only view
+        into a single memory map of the .rmdp file, it is only valid until the
+        iterator advances, copy it (e.g. with bytes()) if it needs to be kept.
+        Buffers derived from it (slices, NumPy arrays) keep the memory map
+        alive until they are garbage collected.
+
+        Example:
+            with Package.open_archive(Path("data.rmdp")) as files:
+                for path, entry, data in files:
+                    digest = hashlib.sha1(data).hexdigest()
+        """
+        bin_path = archive_path.with_suffix(".bin")
+        rmdp_path = archive_path.with_suffix(".rmdp")
+
+        for path in [bin_path, rmdp_path]:
+            if not path.exists():
+                raise FileNotFoundError(f"Required package file is missing: {path}")
+
+        package = cls(header_path=bin_path)
+
+        with rmdp_path.open("rb") as f:
+            data = (
+                mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+                if rmdp_path.stat().st_size > 0
+                else b""
+            )
+
+            files = package.__iter_file_data(data)
+
+            try:
+                yield files
+            finally:
+                # Releases the view handed out last, the map can't be closed before
+                files.close()
+
+                if isinstance(data, mmap.mmap):
+                    Package.__release(data)
+
+    @staticmethod
+    def __release(buffer: memoryview | mmap.mmap):
+        # Buffers derived from file data (e.g. NumPy arrays or slices) may still
+        # be alive, the memory is then freed once they're garbage collected
+        try:
+            if isinstance(buffer, memoryview):
+                buffer.release()
+            else:
+                buffer.close()
+        except BufferError:
+            pass
+
+    def __iter_file_data(
+        self, data: mmap.mmap | bytes
+    ) -> Iterator[tuple[Path, FileEntry, memoryview]]:
+        buffer = memoryview(data)
+
+        try:
+            for file in sorted(self.__files, key=lambda file: file.offset):
+                if file.offset + file.size > len(buffer):
+                    raise ValueError(
+                        f"Unexpected end of file while reading {file.name}. "
+                        f"Expected {file.size} bytes at offset {hex(file.offset)}, "
+                        f"but package data is only {len(buffer)} bytes long."
+                    )
+
+                view = buffer[file.offset : file.offset + file.size]
+
+                try:
+                    yield self.get_file_path(file), file, view
+                finally:
+                    Package.__release(view)
+        finally:
+            Package.__release(buffer)
+
+    def search(
+        self,
+        rmdp_path: Path,
+        pattern: re.Pattern[bytes],
+        files: list[FileEntry] | None = None,
+        max_workers: int | None = None,
+    ) -> Iterator[tuple[FileEntry, int]]:
+        entries = files if files is not None else self.__files
+
+        ranges = sorted(
+            (
+                (idx, file.offset, file.offset + file.size)
+                for idx, file in enumerate(entries)
+                if file.size > 0
+            ),
+            key=lambda entry: entry[1],
+        )
+
+        batches = search.split_ranges(ranges, SEARCH_BATCH_SIZE)
+
+        if max_workers == 1 or len(batches) <= 1:
+            # Not worth spinning up worker processes, scan in this process
+            search.open_archive(rmdp_path)
+
+            try:
+                results = (search.scan(pattern, batch) for batch in batches)
+                yield from self.__iter_search_results(entries, results)
+            finally:
+                search.close_archive()
+
+            return
+
+        with ProcessPoolExecutor(
+            max_workers=max_workers,
+            initializer=search.open_archive,
+            initargs=(rmdp_path,),
+        ) as executor:
+            results = executor.map(search.scan, [pattern] * len(batches), batches)
+
+            yield from self.__iter_search_results(entries, results)
+
+    def __iter_search_results(
+        self,
+        entries: list[FileEntry],
+        results: Iterator[list[tuple[int, list[int]]]],
+    ) -> Iterator[tuple[FileEntry, int]]:
+        for batch_results in results:
+            for idx, offsets in batch_results:
+                for offset in offsets:
+                    yield entries[idx], offset
+
     def __create_root_folder(self):
         """Create a root folder entry with default values."""
         self.__folders = []
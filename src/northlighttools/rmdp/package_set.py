@@ -0,0 +1,187 @@
+import json
+from collections.abc import Iterator
+from concurrent.futures import ProcessPoolExecutor
+from fnmatch import fnmatch
+from pathlib import Path
+
+from northlighttools.rmdp.dataclasses.entry_indexed import IndexEntry
+from northlighttools.rmdp.package import Package
+
+INDEX_FORMAT_VERSION = 1
+
+
+def read_archive_entries(bin_path: Path) -> list[tuple[str, int, int, int, int]]:
+    # Runs in worker processes, so only plain tuples are sent back
+    package = Package(header_path=bin_path)
+    folder_paths = [package.get_folder_path(folder) for folder in package.folders]
+
+    return [
+        (
+            (folder_paths[file.parent_folder_id] / file.name).as_posix(),
+            idx,
+            file.offset,
+            file.size,
+            file.data_checksum,
+        )
+        for idx, file in enumerate(package.files)
+    ]
+
+
+class PackageSet:
+    """
+    Merged view over multiple Remedy Packages (e.g. whole game install).
+
+    Archives are kept in priority order, when the same path is present in more
+    than one archive, the copy from the archive listed first wins.
+    """
+
+    def __init__(
+        self,
+        archive_paths: list[Path] | None = None,
+        max_workers: int | None = None,
+    ):
+        self.__archives: list[Path] = []
+        self.__index: dict[str, list[IndexEntry]] = {}
+
+        if archive_paths:
+            self.__load(archive_paths, max_workers)
+
+    @property
+    def archives(self) -> list[Path]:
+        return self.__archives
+
+    @staticmethod
+    def find_archives(game_dir: Path, priority: list[str] | None = None) -> list[Path]:
+        # Only .bin files with matching .rmdp are package headers,
+        # skip others (like string_table.bin)
+        game_dir = game_dir.resolve()
+        archives = sorted(
+            path
+            for path in game_dir.rglob("*.bin")
+            if path.with_suffix(".rmdp").is_file()
+        )
+
+        if not priority:
+            return archives
+
+        def rank(path: Path) -> int:
+            relative_path = path.relative_to(game_dir).as_posix()
+
+            for idx, pattern in enumerate(priority):
+                if fnmatch(relative_path, pattern) or fnmatch(path.name, pattern):
+                    return idx
+
+            return len(priority)
+
+        return sorted(archives, key=rank)
+
+    def __load(self, archive_paths: list[Path], max_workers: int | None):
+        self.__archives = list(archive_paths)
+
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            results = executor.map(read_archive_entries, self.__archives)
+
+            for archive_path, entries in zip(self.__archives, results):
+                for path, file_index, offset, size, data_checksum in entries:
+                    self.__add_entry(
+                        IndexEntry(
+                            path=path,
+                            archive_path=archive_path,
+                            file_index=file_index,
+                            offset=offset,
+                            size=size,
+                            data_checksum=data_checksum,
+                        )
+                    )
+
+    def __add_entry(self, entry: IndexEntry):
+        # Package paths are case-insensitive (checksums are of lowercase names)
+        self.__index.setdefault(entry.path.lower(), []).append(entry)
+
+    def lookup(self, path: str | Path) -> list[IndexEntry]:
+        # All copies of the path, the winning one first
+        key = path.as_posix() if isinstance(path, Path) else path.replace("\\", "/")
+        return self.__index.get(key.lower(), [])
+
+    def get(self, path: str | Path) -> IndexEntry | None:
+        entries = self.lookup(path)
+        return entries[0] if entries else None
+
+    def __iter__(self) -> Iterator[IndexEntry]:
+        # Winning copy of every path in the set
+        for entries in self.__index.values():
+            yield entries[0]
+
+    def __len__(self) -> int:
+        return len(self.__index)
+
+    def get_overridden(self) -> Iterator[list[IndexEntry]]:
+        for entries in self.__index.values():
+            if len(entries) > 1:
+                yield entries
+
+    def is_up_to_date(self, archive_paths: list[Path], index_path: Path) -> bool:
+        if archive_paths != self.__archives or not index_path.exists():
+            return False
+
+        index_mtime = index_path.stat().st_mtime_ns
+
+        return all(path.stat().st_mtime_ns <= index_mtime for path in self.__archives)
+
+    def save(self, index_path: Path):
+        archive_ids = {path: idx for idx, path in enumerate(self.__archives)}
+
+        data = {
+            "version": INDEX_FORMAT_VERSION,
+            "archives": [str(path.resolve()) for path in self.__archives],
+            "entries": [
+                [
+                    entry.path,
+                    archive_ids[entry.archive_path],
+                    entry.file_index,
+                    entry.offset,
+                    entry.size,
+                    entry.data_checksum,
+                ]
+                for entries in self.__index.values()
+                for entry in entries
+            ],
+        }
+
+        with index_path.open("w", encoding="utf-8") as f:
+            json.dump(data, f, separators=(",", ":"))
+
+    @classmethod
+    def load(cls, index_path: Path) -> "PackageSet":
+        # Truncated or otherwise damaged file raises JSONDecodeError (or
+        # UnicodeDecodeError), which are ValueErrors as well
+        with index_path.open("r", encoding="utf-8") as f:
+            data = json.load(f)
+
+        version = data.get("version") if isinstance(data, dict) else None
+
+        if version != INDEX_FORMAT_VERSION:
+            raise ValueError(f"Unsupported index version {version} in {index_path}")
+
+        package_set = cls()
+
+        try:
+            package_set.__archives = [Path(path) for path in data["archives"]]
+
+            for path, archive_id, file_index, offset, size, data_checksum in data[
+                "entries"
+            ]:
+                package_set.__add_entry(
+                    IndexEntry(
+                        path=path,
+                        archive_path=package_set.__archives[archive_id],
+                        file_index=file_index,
+                        offset=offset,
+                        size=size,
+                        data_checksum=data_checksum,
+                    )
+                )
+        except (KeyError, IndexError, TypeError) as e:
+            raise ValueError(f"Index file {index_path} is corrupted") from e
+
+        return package_set
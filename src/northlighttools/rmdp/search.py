@@ -0,0 +1,87 @@
+import mmap
+import re
+from pathlib import Path
+
+from northlighttools.rmdp.enumerators.text_encoding import TextEncoding
+
+# Memory-mapped .rmdp file shared by all scans running in the current process
+archive: mmap.mmap | None = None
+
+
+def compile_pattern(
+    pattern: str,
+    encodings: list[TextEncoding],
+    regex: bool = False,
+    ignore_case: bool = False,
+) -> re.Pattern[bytes]:
+    flags = re.IGNORECASE if ignore_case else 0
+
+    if regex:
+        # Regular expressions are matched against raw bytes, so UTF-16LE text
+        # has to be spelled out explicitly (e.g. "h\x00i\x00")
+        return re.compile(pattern.encode("utf-8"), flags)
+
+    alternatives = dict.fromkeys(
+        re.escape(pattern.encode(encoding.value)) for encoding in encodings
+    )
+
+    return re.compile(b"|".join(alternatives), flags)
+
+
+def open_archive(rmdp_path: Path):
+    global archive
+
+    with rmdp_path.open("rb") as f:
+        archive = (
+            mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            if rmdp_path.stat().st_size > 0
+            else None
+        )
+
+
+def close_archive():
+    global archive
+
+    if archive is not None:
+        archive.close()
+        archive = None
+
+
+def scan(
+    pattern: re.Pattern[bytes], ranges: list[tuple[int, int, int]]
+) -> list[tuple[int, list[int]]]:
+    # Each range is (file index, start offset, end offset) in the .rmdp file,
+    # returned offsets are relative to the start of the file entry
+    results = []
+
+    if archive is None:
+        return results
+
+    for idx, start, end in ranges:
+        offsets = [
+            match.start() - start for match in pattern.finditer(archive, start, end)
+        ]
+
+        if offsets:
+            results.append((idx, offsets))
+
+    return results
+
+
+def split_ranges(
+    ranges: list[tuple[int, int, int]], batch_size: int
+) -> list[list[tuple[int, int, int]]]:
+    batches, batch, batch_bytes = [], [], 0
+
+    for entry in ranges:
+        batch.append(entry)
+        batch_bytes += entry[2] - entry[1]
+
+        if batch_bytes >= batch_size:
+            batches.append(batch)
+            batch, batch_bytes = [], 0
+
+    if batch:
+        batches.append(batch)
+
+    return batches
@@ -45,12 +45,19 @@ def cmd_export(
             case_sensitive=False,
         ),
     ] = DataFormat.XLF,
+    use_translate_toolkit: Annotated[
+        bool,
+        typer.Option(
+            "--translate-toolkit",
+            help="Build the whole document with translate-toolkit before saving it (slower, uses more memory)",
+        ),
+    ] = False,
 ):
     output_path = output_path or input_path.with_suffix(f".{output_type.name.lower()}")
     output_path.parent.mkdir(parents=True, exist_ok=True)
 
     table = StringTable(input_file=input_path)
-    table.export(output_path, output_type)
+    table.export(output_path, output_type, use_translate_toolkit)
 
     print(f"Successfully exported string table to {output_path}!")
 
@@ -1,4 +1,5 @@
-from io import BufferedReader
+import codecs
+import struct
 from pathlib import Path
 
 from translate.storage import csvl10n, po, xliff, xliff2
@@ -9,29 +10,93 @@ from northlighttools.string_table.enumerators.missing_string_behaviour import (
     MissingStringBehaviour,
 )
 from northlighttools.string_table.helpers import get_translated_string
+from northlighttools.string_table.writers import (
+    write_csv,
+    write_po,
+    write_xliff,
+    write_xliff2,
+)
+
+UINT32 = struct.Struct("<I")
 
 
 class StringTable:
     def __init__(self, input_file: Path | None = None):
         self.__input_file = input_file.name if input_file else "string_table.bin"
+        self.__entries: dict[str, str] = {}
 
         if input_file is not None:
-            with input_file.open("rb") as file:
-                self.__load(file)
+            self.__load(input_file.read_bytes())
 
-    def __load(self, reader: BufferedReader):
-        self.__entries = {}
+    @property
+    def entries(self) -> dict[str, str]:
+        return self.__entries
 
-        strings_count = int.from_bytes(reader.read(4), "little")
-
-        for _ in range(strings_count):
-            key_len = int.from_bytes(reader.read(4), "little")
-            key = reader.read(key_len).decode("utf-8")
-            value_len = int.from_bytes(reader.read(4), "little")
-            value = reader.read(value_len * 2).decode("utf-16le")
-            self.__entries[key] = value.replace("\r\n", "").replace("\\n", "\n")
+    def __load(self, data: bytes):
+        self.__entries = {}
 
-    def export(self, output_path: Path, output_type: DataFormat):
+        unpack = UINT32.unpack_from
+        decode_utf8 = codecs.utf_8_decode
+        decode_utf16 = codecs.utf_16_le_decode
+
+        # Keys and values are decoded straight from slices of the file buffer
+        with memoryview(data) as buffer:
+            try:
+                (strings_count,) = unpack(buffer, 0)
+                offset = UINT32.size
+
+                for _ in range(strings_count):
+                    (key_len,) = unpack(buffer, offset)
+                    offset += UINT32.size
+                    key = decode_utf8(
+                        buffer[offset : offset + key_len], "strict", True
+                    )[0]
+                    offset += key_len
+
+                    (value_len,) = unpack(buffer, offset)
+                    offset += UINT32.size
+                    value = decode_utf16(
+                        buffer[offset : offset + value_len * 2], "strict", True
+                    )[0]
+                    offset += value_len * 2
+
+                    # Most values have no line breaks, those are not scanned again
+                    if "\r" in value:
+                        value = value.replace("\r\n", "").replace("\\n", "\n")
+                    elif "\\" in value:
+                        value = value.replace("\\n", "\n")
+
+                    self.__entries[key] = value
+            except struct.error:
+                offset = len(buffer) + 1
+
+            # Slices past the end of buffer are just shorter
+            if offset > len(buffer):
+                raise ValueError("Unexpected end of file while reading string table.")
+
+    def export(
+        self,
+        output_path: Path,
+        output_type: DataFormat,
+        use_translate_toolkit: bool = False,
+    ):
+        if use_translate_toolkit:
+            self.__export_translate_toolkit(output_path, output_type)
+            return
+
+        # Entries are written straight to the file, no document is built
+        with output_path.open("w", encoding="utf-8", newline="") as f:
+            match output_type:
+                case DataFormat.XLIFF:
+                    write_xliff(f, self.__entries, self.__input_file)
+                case DataFormat.XLF:
+                    write_xliff2(f, self.__entries, self.__input_file)
+                case DataFormat.PO:
+                    write_po(f, self.__entries)
+                case DataFormat.CSV:
+                    write_csv(f, self.__entries)
+
+    def __export_translate_toolkit(self, output_path: Path, output_type: DataFormat):
         match output_type:
             case DataFormat.XLIFF:
                 storage = xliff.Xliff1File()
@@ -0,0 +1,171 @@
+import csv
+from typing import TextIO
+
+from translate.misc.xml_helpers import valid_chars_only
+from translate.storage import po
+from translate.storage.pypo import escapeforpo, quoteforpo
+from translate.storage.xliff import ID_SEPARATOR, ID_SEPARATOR_SAFE
+from translate.storage.xliff2 import SEGMENT_AUTO_ID, SEGMENT_SEPARATOR
+
+# Output of every writer is the same as of translate-toolkit storage with one
+# unit per entry (source set, id or context set to key), but entries are
+# written as soon as they are read and no unit objects are created
+
+
+def escape_text(text: str) -> str:
+    # Same escaping as lxml uses for element text
+    for char, entity in (("&", "&amp;"), ("<", "&lt;"), (">", "&gt;")):
+        if char in text:
+            text = text.replace(char, entity)
+
+    if "\r" in text:
+        text = text.replace("\r", "&#13;")
+
+    # Control characters are not allowed in XML 1.0, translate-toolkit drops them
+    if not text.isprintable():
+        text = valid_chars_only(text)
+
+    return text
+
+
+def escape_attrib(text: str) -> str:
+    # Same escaping as lxml uses for attribute values
+    for char, entity in (
+        ("&", "&amp;"),
+        ("<", "&lt;"),
+        (">", "&gt;"),
+        ('"', "&quot;"),
+        ("\t", "&#9;"),
+        ("\n", "&#10;"),
+        ("\r", "&#13;"),
+    ):
+        if char in text:
+            text = text.replace(char, entity)
+
+    if not text.isprintable():
+        text = valid_chars_only(text)
+
+    return text
+
+
+def write_xliff(writer: TextIO, entries: dict[str, str], file_name: str):
+    writer.write(
+        '<?xml version="1.0" encoding="UTF-8"?>\n'
+        '<xliff xmlns="urn:oasis:names:tc:xliff:document:1.1" version="1.1">\n'
+        f'  <file original="{escape_attrib(file_name)}" source-language="en"'
+        ' datatype="plaintext">\n'
+    )
+
+    if not entries:
+        writer.write("    <body/>\n  </file>\n</xliff>\n")
+        return
+
+    writer.write("    <body>\n")
+
+    for key, value in entries.items():
+        # Separator would start new file, it's restored by import
+        key = key.replace(ID_SEPARATOR, ID_SEPARATOR_SAFE)
+
+        writer.write(
+            f'      <trans-unit xml:space="preserve" id="{escape_attrib(key)}">\n'
+            f"        <source>{escape_text(value)}</source>\n"
+            "      </trans-unit>\n"
+        )
+
+    writer.write("    </body>\n  </file>\n</xliff>\n")
+
+
+def write_xliff2(writer: TextIO, entries: dict[str, str], file_name: str):
+    writer.write(
+        '<?xml version="1.0" encoding="UTF-8"?>\n'
+        '<xliff xmlns="urn:oasis:names:tc:xliff:document:2.0" version="2.0"'
+        ' srcLang="en">\n'
+        f'  <file id="{escape_attrib(file_name)}"'
+    )
+
+    if not entries:
+        writer.write("/>\n</xliff>\n")
+        return
+
+    writer.write(">\n")
+
+    for key, value in entries.items():
+        unit_id, _, segment_id = key.partition(SEGMENT_SEPARATOR)
+
+        unit_attrib = f' id="{escape_attrib(unit_id)}"' if key else ""
+        segment_attrib = (
+            f' id="{escape_attrib(segment_id)}"'
+            if segment_id and not segment_id.startswith(SEGMENT_AUTO_ID)
+            else ""
+        )
+
+        writer.write(
+            f"    <unit{unit_attrib}>\n"
+            f'      <segment xml:space="preserve"{segment_attrib}>'
+            f"<source>{escape_text(value)}</source>\n"
+            "      </segment>\n"
+            "    </unit>\n"
+        )
+
+    writer.write("  </file>\n</xliff>\n")
+
+
+def quote_po(keyword: str, text: str) -> str:
+    # Most strings fit in a single line, those are not passed through wrapper
+    # (ASCII only, as wide characters count twice towards line width)
+    if text.isascii():
+        escaped = escapeforpo(text)
+
+        # Lines are also broken after every escaped line break
+        if len(escaped) <= 71 and "\\n" not in escaped:
+            return f'{keyword} "{escaped}"\n'
+
+    lines = quoteforpo(text)
+
+    if not lines:
+        return f'{keyword} ""\n'
+
+    return f"{keyword} " + "\n".join(lines) + "\n"
+
+
+def write_po(writer: TextIO, entries: dict[str, str]):
+    writer.write(str(po.pofile().header()))
+
+    for key, value in entries.items():
+        # Units without context and source are written as empty string
+        if key or value:
+            writer.write(
+                "\n"
+                + (quote_po("msgctxt", key) if key else "")
+                + quote_po("msgid", value)
+                + 'msgstr ""\n'
+            )
+        else:
+            writer.write("\n")
+
+
+class CSVDialect(csv.excel):
+    # Same as default dialect of translate-toolkit
+    skipinitialspace = True
+    quoting = csv.QUOTE_ALL
+    escapechar = "\\"
+
+
+CSV_FIELDS = [
+    "location",
+    "source",
+    "target",
+    "id",
+    "fuzzy",
+    "context",
+    "translator_comments",
+    "developer_comments",
+]
+
+
+def write_csv(writer: TextIO, entries: dict[str, str]):
+    csv_writer = csv.writer(writer, dialect=CSVDialect)
+    csv_writer.writerow(CSV_FIELDS)
+    csv_writer.writerows(
+        ("", value, "", key, "False", "", "", "") for key, value in entries.items()
+    )
@@ -0,0 +1,28 @@
+from pathlib import Path
+
+import pytest
+from typer.testing import CliRunner
+
+from northlighttools import app
+
+
+@pytest.fixture
+def make_package(tmp_path):
+    # Packs {package path: data} into .bin/.rmdp pair, returns path of .bin
+    def make(name: str, files: dict[str, bytes]) -> Path:
+        input_dir = tmp_path / f"{name}_input"
+
+        for package_path, data in files.items():
+            file_path = input_dir / package_path
+            file_path.parent.mkdir(parents=True, exist_ok=True)
+            file_path.write_bytes(data)
+
+        output_path = tmp_path / "game" / f"{name}.rmdp"
+        result = CliRunner().invoke(
+            app, ["rmdp", "pack", str(input_dir), str(output_path)]
+        )
+        assert result.exit_code == 0, result.output
+
+        return output_path.with_suffix(".bin")
+
+    return make
@@ -0,0 +1,25 @@
+import pytest
+
+from northlighttools.binfnt.batch import decompile_font
+from northlighttools.binfnt.benchmark import generate_font
+from northlighttools.binfnt.enumerators.font_version import FontVersion
+
+
+def test_decompile_font_writes_output(tmp_path):
+    font_path = generate_font(tmp_path, FontVersion.QUANTUM_BREAK, 16, 64, 4)
+    output_dir = tmp_path / "out" / "font"
+
+    decompile_font(font_path, output_dir, separate_chars=False)
+
+    assert {path.suffix for path in output_dir.iterdir()} == {".xml", ".png"}
+
+
+def test_decompile_font_failure_leaves_no_directory(tmp_path):
+    font_path = tmp_path / "bad.binfnt"
+    font_path.write_bytes(b"\x07\x00\x00\x00garbage")
+    output_dir = tmp_path / "out" / "bad"
+
+    with pytest.raises(ValueError):
+        decompile_font(font_path, output_dir, separate_chars=False)
+
+    assert not output_dir.exists()
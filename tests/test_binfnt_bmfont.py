@@ -0,0 +1,165 @@
+import struct
+
+import numpy as np
+import pytest
+from PIL import Image
+from typer.testing import CliRunner
+
+from northlighttools import app
+from northlighttools.binfnt.benchmark import R16F_ALPHA_TOLERANCE
+from northlighttools.binfnt.bmfont import BINARY_MAGIC, BINARY_VERSION, BMFont
+from northlighttools.binfnt.constants import CHARS_FOLDER
+from northlighttools.binfnt.dtypes import BMFONT_CHAR_DTYPE, BMFONT_KERNING_DTYPE
+
+runner = CliRunner()
+
+FONT_SIZE = 16
+LINE_HEIGHT = 18
+BASE = 14
+PAGE_SIZE = 16
+PAGES = ["font_0.png", "font_1.png"]
+
+# id, x, y, width, height, xoffset, yoffset, xadvance, page, chnl
+CHARS = np.array(
+    [
+        (65, 0, 0, 5, 7, -1, 2, 6, 0, 15),
+        (66, 8, 0, 6, 7, 0, 2, 7, 0, 15),
+        (233, 0, 0, 6, 9, 0, 0, 7, 1, 15),
+        (32, 0, 0, 0, 0, 0, 14, 4, 0, 15),
+    ],
+    dtype=BMFONT_CHAR_DTYPE,
+)
+KERNINGS = np.array([(65, 66, -1), (66, 233, 2)], dtype=BMFONT_KERNING_DTYPE)
+
+
+def write_text(fnt_path):
+    lines = [
+        f'info face="Test Font" size=-{FONT_SIZE} bold=0 italic=0',
+        f"common lineHeight={LINE_HEIGHT} base={BASE} scaleW={PAGE_SIZE}"
+        f" scaleH={PAGE_SIZE} pages={len(PAGES)} packed=0",
+        *(f'page id={page_id} file="{page}"' for page_id, page in enumerate(PAGES)),
+        f"chars count={len(CHARS)}",
+        *(
+            "char " + " ".join(f"{name}={char[name]}" for name in CHARS.dtype.names)
+            for char in CHARS
+        ),
+        f"kernings count={len(KERNINGS)}",
+        *(
+            "kerning "
+            + " ".join(f"{name}={kerning[name]}" for name in KERNINGS.dtype.names)
+            for kerning in KERNINGS
+        ),
+    ]
+
+    fnt_path.write_text("\n".join(lines) + "\n", encoding="utf-8")
+
+
+def write_xml(fnt_path):
+    def element(tag, records):
+        return "".join(
+            f"<{tag} "
+            + " ".join(f'{name}="{record[name]}"' for name in records.dtype.names)
+            + "/>"
+            for record in records
+        )
+
+    pages = "".join(
+        f'<page id="{page_id}" file="{page}"/>' for page_id, page in enumerate(PAGES)
+    )
+
+    fnt_path.write_text(
+        '<?xml version="1.0"?>\n<font>'
+        f'<info face="Test Font" size="-{FONT_SIZE}"/>'
+        f'<common lineHeight="{LINE_HEIGHT}" base="{BASE}" scaleW="{PAGE_SIZE}"'
+        f' scaleH="{PAGE_SIZE}" pages="{len(PAGES)}"/>'
+        f"<pages>{pages}</pages>"
+        f'<chars count="{len(CHARS)}">{element("char", CHARS)}</chars>'
+        f'<kernings count="{len(KERNINGS)}">{element("kerning", KERNINGS)}</kernings>'
+        "</font>",
+        encoding="utf-8",
+    )
+
+
+def write_binary(fnt_path):
+    def block(block_type, data):
+        return struct.pack("<BI", block_type, len(data)) + data
+
+    info = struct.pack("<hBBHB4B2BB", -FONT_SIZE, 0, 0, 100, 1, *[0] * 4, 1, 1, 0)
+    common = struct.pack(
+        "<5H5B", LINE_HEIGHT, BASE, PAGE_SIZE, PAGE_SIZE, len(PAGES), *[0] * 5
+    )
+    pages = b"".join(page.encode("utf-8") + b"\0" for page in PAGES)
+
+    fnt_path.write_bytes(
+        BINARY_MAGIC
+        + bytes([BINARY_VERSION])
+        + block(1, info + b"Test Font\0")
+        + block(2, common)
+        + block(3, pages)
+        + block(4, CHARS.tobytes())
+        + block(5, KERNINGS.tobytes())
+    )
+
+
+def write_pages(output_dir) -> list[np.ndarray]:
+    # 8-bit pages with different random glyphs, nothing is fully transparent
+    rng = np.random.default_rng(0)
+    pages = []
+
+    for page in PAGES:
+        alpha = rng.integers(1, 256, (PAGE_SIZE, PAGE_SIZE), dtype=np.uint8)
+        Image.fromarray(alpha).save(output_dir / page)
+        pages.append(alpha)
+
+    return pages
+
+
+@pytest.mark.parametrize("write", [write_text, write_xml, write_binary])
+def test_formats_parse_to_same_font(tmp_path, write):
+    fnt_path = tmp_path / "font.fnt"
+    write(fnt_path)
+
+    bmfont = BMFont(fnt_path)
+
+    assert bmfont.font_size == FONT_SIZE
+    assert bmfont.line_height == LINE_HEIGHT
+    assert bmfont.base == BASE
+    assert (bmfont.texture_width, bmfont.texture_height) == (PAGE_SIZE, PAGE_SIZE)
+    assert bmfont.pages == PAGES
+    assert np.array_equal(bmfont.chars, CHARS)
+    assert np.array_equal(bmfont.kernings, KERNINGS)
+
+
+def test_compile_merges_pages_into_one_atlas(tmp_path):
+    fnt_path = tmp_path / "font.fnt"
+    write_text(fnt_path)
+    pages = write_pages(tmp_path)
+
+    font_path = tmp_path / "font.binfnt"
+    result = runner.invoke(
+        app, ["binfnt", "compile", str(fnt_path), str(font_path), "--from-bmfont"]
+    )
+    assert result.exit_code == 0, result.output
+    assert "Merging 2 page(s)" in result.output
+
+    output_dir = tmp_path / "decompiled"
+    result = runner.invoke(
+        app, ["binfnt", "decompile", str(font_path), str(output_dir), "-s"]
+    )
+    assert result.exit_code == 0, result.output
+
+    # Every glyph is cut from its own page, wherever it was packed
+    for char in CHARS[CHARS["width"] > 0]:
+        expected = pages[char["page"]][
+            char["y"] : char["y"] + char["height"],
+            char["x"] : char["x"] + char["width"],
+        ]
+
+        with Image.open(output_dir / CHARS_FOLDER / f"{char['id']}.png") as image:
+            actual = np.asarray(image.convert("RGBA"))[..., 3]
+
+        assert actual.shape == expected.shape
+        assert (
+            np.abs(actual.astype(int) - expected.astype(int)).max()
+            <= R16F_ALPHA_TOLERANCE
+        )
@@ -0,0 +1,213 @@
+import io
+import xml.etree.ElementTree as ET
+
+import numpy as np
+import pytest
+from PIL import Image
+from rich.console import Console
+
+from northlighttools.binfnt.batch import decompile_font
+from northlighttools.binfnt.benchmark import SYNTHETIC_FONT_NAME, generate_font
+from northlighttools.binfnt.cache import BuildCache
+from northlighttools.binfnt.constants import CHARS_FOLDER
+from northlighttools.binfnt.enumerators.font_version import FontVersion
+from northlighttools.binfnt.font import BinaryFont
+from northlighttools.rmdp import Progress
+
+# 10 glyphs are laid out in 4x4 grid of 16 pixel cells, last row is empty
+FREE_CELL = (32, 48)
+
+
+@pytest.fixture
+def log():
+    return io.StringIO()
+
+
+@pytest.fixture
+def progress(log):
+    with Progress(console=Console(file=log, width=200), disable=True) as progress:
+        yield progress
+
+
+def clear(log: io.StringIO):
+    log.seek(0)
+    log.truncate()
+
+
+def decompile(tmp_path, version: FontVersion, separate_characters: bool):
+    font_path = generate_font(tmp_path, version, 10, 64, 8)
+    output_dir = tmp_path / "decompiled"
+
+    decompile_font(font_path, output_dir, separate_chars=separate_characters)
+
+    return output_dir / f"{SYNTHETIC_FONT_NAME}.xml"
+
+
+def compile_full(tmp_path, meta_path, separate_characters: bool) -> bytes:
+    output_path = tmp_path / "full.binfnt"
+
+    with Progress(console=Console(quiet=True), disable=True) as progress:
+        font = BinaryFont(progress)
+        font.compile(meta_path, separate_characters)
+        font.save(output_path)
+
+    return output_path.read_bytes()
+
+
+def edit_xml(meta_path, edit):
+    tree = ET.parse(meta_path)
+    edit(tree.getroot().find("Characters"))
+    tree.write(meta_path, encoding="utf-8")
+
+
+def first_char(chars: ET.Element) -> ET.Element:
+    # Whitespace characters have no bitmap, first one with bitmap is edited
+    return next(char for char in chars if char.get("width") != "0")
+
+
+def char_path(meta_path, char: ET.Element):
+    return meta_path.parent / CHARS_FOLDER / f"{char.get('index')}.png"
+
+
+def edit_bitmap(meta_path):
+    char = first_char(ET.parse(meta_path).getroot().find("Characters"))
+    path = char_path(meta_path, char)
+
+    pixels = np.asarray(Image.open(path).convert("RGBA")).copy()
+    pixels[..., :3] = 255
+    pixels[..., 3] = 255 - pixels[..., 3]
+    Image.fromarray(pixels).save(path)
+
+
+def change_advance(meta_path):
+    def edit(chars):
+        char = first_char(chars)
+        char.set("xadvance", str(float(char.get("xadvance")) + 3))
+
+    edit_xml(meta_path, edit)
+
+
+def move_character(meta_path):
+    def edit(chars):
+        char = first_char(chars)
+        char.set("x", str(FREE_CELL[0]))
+        char.set("y", str(FREE_CELL[1]))
+
+    edit_xml(meta_path, edit)
+
+
+def resize_character(meta_path):
+    def edit(chars):
+        char = first_char(chars)
+        path = char_path(meta_path, char)
+
+        with Image.open(path) as image:
+            cropped = image.crop((0, 0, image.width - 1, image.height - 1))
+
+        cropped.save(path)
+        char.set("width", str(cropped.width))
+        char.set("height", str(cropped.height))
+
+    edit_xml(meta_path, edit)
+
+
+def add_character(meta_path):
+    def edit(chars):
+        pixels = np.full((5, 7, 4), 255, dtype=np.uint8)
+        Image.fromarray(pixels).save(meta_path.parent / CHARS_FOLDER / "1000.png")
+
+        ET.SubElement(
+            chars,
+            "Character",
+            index="1000",
+            char="Ω",
+            x=str(FREE_CELL[0]),
+            y=str(FREE_CELL[1]),
+            width="7",
+            height="5",
+            xoffset="0",
+            yoffset="0",
+            xadvance="8",
+            chnl="15",
+        )
+
+    edit_xml(meta_path, edit)
+
+
+def remove_character(meta_path):
+    def edit(chars):
+        char = first_char(chars)
+        char_path(meta_path, char).unlink()
+        chars.remove(char)
+
+    edit_xml(meta_path, edit)
+
+
+def test_unchanged_font_uses_cached_build(tmp_path, progress, log):
+    meta_path = decompile(tmp_path, FontVersion.QUANTUM_BREAK, True)
+    cache = BuildCache(progress, tmp_path / "cache")
+
+    cache.build(meta_path, tmp_path / "first.binfnt", True)
+    cache.build(meta_path, tmp_path / "second.binfnt", True)
+
+    assert "Font is up to date" in log.getvalue()
+    assert (tmp_path / "second.binfnt").read_bytes() == compile_full(
+        tmp_path, meta_path, True
+    )
+
+
+@pytest.mark.parametrize("separate_characters", [False, True])
+def test_metadata_change_reuses_texture(tmp_path, progress, log, separate_characters):
+    meta_path = decompile(tmp_path, FontVersion.QUANTUM_BREAK, separate_characters)
+    cache = BuildCache(progress, tmp_path / "cache")
+    output_path = tmp_path / "cached.binfnt"
+
+    cache.build(meta_path, output_path, separate_characters)
+    change_advance(meta_path)
+    clear(log)
+    cache.build(meta_path, output_path, separate_characters)
+
+    assert "Texture is unchanged" in log.getvalue()
+    assert output_path.read_bytes() == compile_full(
+        tmp_path, meta_path, separate_characters
+    )
+
+
+@pytest.mark.parametrize(
+    "edit, regions",
+    [
+        (edit_bitmap, 1),
+        (move_character, 2),
+        (resize_character, 2),
+        (add_character, 1),
+        (remove_character, 1),
+    ],
+)
+def test_character_change_updates_texture_regions(
+    tmp_path, progress, log, edit, regions
+):
+    meta_path = decompile(tmp_path, FontVersion.QUANTUM_BREAK, True)
+    cache = BuildCache(progress, tmp_path / "cache")
+    output_path = tmp_path / "cached.binfnt"
+
+    cache.build(meta_path, output_path, True)
+    edit(meta_path)
+    clear(log)
+    cache.build(meta_path, output_path, True)
+
+    assert f"Updating {regions} texture region(s)" in log.getvalue()
+    assert output_path.read_bytes() == compile_full(tmp_path, meta_path, True)
+
+
+def test_other_versions_are_fully_rebuilt(tmp_path, progress, log):
+    meta_path = decompile(tmp_path, FontVersion.ALAN_WAKE_REMASTERED, True)
+    cache = BuildCache(progress, tmp_path / "cache")
+    output_path = tmp_path / "cached.binfnt"
+
+    cache.build(meta_path, output_path, True)
+    edit_bitmap(meta_path)
+    clear(log)
+    cache.build(meta_path, output_path, True)
+
+    assert "Creating texture atlas from character files" in log.getvalue()
+    assert output_path.read_bytes() == compile_full(tmp_path, meta_path, True)
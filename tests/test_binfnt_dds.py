@@ -0,0 +1,120 @@
+import struct
+from io import BytesIO
+
+import numpy as np
+import pytest
+from PIL import Image
+
+from northlighttools.binfnt import dds
+from northlighttools.binfnt.dds import DDS
+
+DDPF_ALPHAPIXELS = 0x1
+DDPF_RGB = 0x40
+
+PIXELS = np.random.default_rng(0).integers(0, 256, (3, 5, 4), dtype=np.uint8)
+
+
+def save_dds(pixels: np.ndarray) -> bytes:
+    data = BytesIO()
+    Image.fromarray(pixels).save(data, format="DDS")
+    return data.getvalue()
+
+
+def with_pixel_format(
+    flags: int, bit_count: int, masks: tuple[int, int, int, int], pixels: bytes
+) -> bytes:
+    header = bytearray(save_dds(PIXELS)[:128])
+    header[80:108] = struct.pack("<7I", flags, 0, bit_count, *masks)
+    return bytes(header) + pixels
+
+
+def pillow_decode(dds_data: bytes) -> np.ndarray:
+    with Image.open(BytesIO(dds_data)) as image:
+        return np.asarray(image.convert("RGBA"))
+
+
+@pytest.fixture
+def no_pillow_decode(monkeypatch):
+    def fail(*args, **kwargs):
+        raise AssertionError("Texture should not be decoded by Pillow")
+
+    monkeypatch.setattr(dds.Image, "open", fail)
+
+
+NUMPY_LAYOUTS = {
+    # Written by compile for Alan Wake fonts
+    "bgra": save_dds(PIXELS),
+    "rgba": with_pixel_format(
+        DDPF_RGB | DDPF_ALPHAPIXELS,
+        32,
+        (0xFF, 0xFF00, 0xFF0000, 0xFF000000),
+        PIXELS.tobytes(),
+    ),
+    "xrgb": with_pixel_format(
+        DDPF_RGB, 32, (0xFF0000, 0xFF00, 0xFF, 0), PIXELS.tobytes()
+    ),
+    "bgr with unused alpha mask": with_pixel_format(
+        DDPF_RGB, 32, (0xFF0000, 0xFF00, 0xFF, 0xFF000000), PIXELS.tobytes()
+    ),
+}
+
+PILLOW_LAYOUTS = {
+    "24-bit rgb": save_dds(PIXELS[..., :3]),
+    "luminance": save_dds(PIXELS[..., 0]),
+    "a2r10g10b10": with_pixel_format(
+        DDPF_RGB | DDPF_ALPHAPIXELS,
+        32,
+        (0x3FF00000, 0xFFC00, 0x3FF, 0xC0000000),
+        PIXELS.tobytes(),
+    ),
+    "2-bit channels": with_pixel_format(
+        DDPF_RGB | DDPF_ALPHAPIXELS, 32, (0x3, 0xC, 0x30, 0xC0), PIXELS.tobytes()
+    ),
+    "a1r5g5b5": with_pixel_format(
+        DDPF_RGB | DDPF_ALPHAPIXELS,
+        16,
+        (0x7C00, 0x3E0, 0x1F, 0x8000),
+        PIXELS[..., :2].tobytes(),
+    ),
+}
+
+
+@pytest.mark.parametrize("dds_data", NUMPY_LAYOUTS.values(), ids=NUMPY_LAYOUTS)
+def test_to_image_decodes_32bit_layouts(dds_data):
+    expected = pillow_decode(dds_data)
+
+    assert np.array_equal(np.asarray(DDS.to_image(dds_data)), expected)
+
+
+def test_to_image_xrgb_is_opaque():
+    image = np.asarray(DDS.to_image(NUMPY_LAYOUTS["xrgb"]))
+
+    assert np.array_equal(image[..., :3], PIXELS[..., 2::-1])
+    assert (image[..., 3] == 255).all()
+
+
+@pytest.mark.parametrize("dds_data", NUMPY_LAYOUTS.values(), ids=NUMPY_LAYOUTS)
+def test_to_image_32bit_layouts_skip_pillow(dds_data, no_pillow_decode):
+    DDS.to_image(dds_data)
+
+
+@pytest.mark.parametrize("dds_data", PILLOW_LAYOUTS.values(), ids=PILLOW_LAYOUTS)
+def test_to_image_falls_back_to_pillow(dds_data):
+    image = DDS.to_image(dds_data)
+
+    assert image.mode == "RGBA"
+    assert np.array_equal(np.asarray(image), pillow_decode(dds_data))
+
+
+@pytest.mark.parametrize("dds_data", PILLOW_LAYOUTS.values(), ids=PILLOW_LAYOUTS)
+def test_to_image_unsupported_layouts_use_pillow(dds_data, no_pillow_decode):
+    with pytest.raises(AssertionError, match="decoded by Pillow"):
+        DDS.to_image(dds_data)
+
+
+def test_to_image_decodes_r16f(no_pillow_decode):
+    alpha = PIXELS[..., 3]
+    image = np.asarray(DDS.to_image(DDS.alpha_to_r16f(alpha)))
+
+    assert image.shape == (*alpha.shape, 4)
+    assert np.array_equal(image[..., 3] > 0, alpha > 0)
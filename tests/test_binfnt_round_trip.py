@@ -0,0 +1,70 @@
+import numpy as np
+import pytest
+
+from northlighttools.binfnt.benchmark import (
+    compare_fonts,
+    generate_font,
+    run_benchmark,
+)
+from northlighttools.binfnt.constants import DDS_R16F_HEADER
+from northlighttools.binfnt.dds import DDS
+from northlighttools.binfnt.enumerators.font_version import FontVersion
+
+
+@pytest.mark.parametrize("separate_characters", [False, True])
+@pytest.mark.parametrize("version", list(FontVersion))
+def test_decompile_compile_round_trip(tmp_path, version, separate_characters):
+    result = run_benchmark(
+        tmp_path,
+        version,
+        glyph_count=100,
+        atlas_size=256,
+        kerning_count=200,
+        separate_characters=separate_characters,
+    )
+
+    assert result.error is None
+    assert [stage.name for stage in result.stages] == [
+        "Load",
+        "Decode texture",
+        "Write XML",
+        "Write PNG",
+        "Compile",
+        "Encode texture",
+        "Save",
+    ]
+
+
+def test_compare_fonts_detects_table_change(tmp_path):
+    font_path = generate_font(tmp_path, FontVersion.QUANTUM_BREAK, 16, 64, 8)
+    changed_path = tmp_path / "changed.binfnt"
+
+    data = bytearray(font_path.read_bytes())
+    data[8] ^= 0xFF  # First character record
+    changed_path.write_bytes(data)
+
+    assert compare_fonts(font_path, font_path) is None
+    assert compare_fonts(font_path, changed_path) == "Content differs at offset 8"
+
+
+def test_r16f_decode_matches_per_pixel_conversion():
+    # Same arithmetic as the original per-pixel float16 conversion
+    pixels = np.arange(0x10000, dtype="<u2")
+    expected = np.zeros((pixels.size, 4), dtype=np.uint8)
+
+    with np.errstate(all="ignore"):
+        for idx, value in enumerate(pixels.view(np.float16)):
+            value = np.nan_to_num(value, nan=255)
+            alpha = int(np.clip(((9 - value) * 255) / 18, 0, 255))
+            expected[idx] = (255, 255, 255, alpha) if alpha > 0 else (0, 0, 0, 0)
+
+    header = DDS_R16F_HEADER[:12] + (
+        (1).to_bytes(4, "little")
+        + pixels.size.to_bytes(4, "little")
+        + (pixels.size * 2).to_bytes(4, "little")
+        + DDS_R16F_HEADER[24:]
+    )
+
+    assert np.array_equal(
+        DDS.r16f_to_array(header + pixels.tobytes()).reshape(-1, 4), expected
+    )
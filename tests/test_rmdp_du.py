@@ -0,0 +1,73 @@
+import json
+
+import pytest
+from typer.testing import CliRunner
+
+from northlighttools import app
+from northlighttools.rmdp.package import Package
+
+runner = CliRunner()
+
+FILES = {
+    "data/a.txt": b"12345",
+    "data/sub/b.txt": b"1234567890",
+    "data/sub/deep/c.txt": bytes(20),
+    "data/other/d.txt": b"x",
+}
+
+
+@pytest.fixture
+def archive_path(make_package):
+    return make_package("data", FILES)
+
+
+def run_du(archive_path, *args) -> dict[str, tuple[int, int, int]]:
+    result = runner.invoke(app, ["rmdp", "du", str(archive_path), "--json", *args])
+    assert result.exit_code == 0, result.output
+
+    return {
+        row["path"]: (row["depth"], row["size"], row["files"])
+        for row in json.loads(result.output)
+    }
+
+
+def test_du_sums_nested_folders(archive_path):
+    assert run_du(archive_path) == {
+        ".": (0, 36, 4),
+        "data": (1, 36, 4),
+        "data/sub": (2, 30, 2),
+        "data/sub/deep": (3, 20, 1),
+        "data/other": (2, 1, 1),
+    }
+
+
+def test_du_max_depth_keeps_recursive_totals(archive_path):
+    assert run_du(archive_path, "--max-depth", "2") == {
+        ".": (0, 36, 4),
+        "data": (1, 36, 4),
+        "data/sub": (2, 30, 2),
+        "data/other": (2, 1, 1),
+    }
+    assert run_du(archive_path, "-d", "0") == {".": (0, 36, 4)}
+
+
+def test_du_top_prints_heaviest_folders(archive_path):
+    assert list(run_du(archive_path, "--top", "4")) == [
+        ".",
+        "data",
+        "data/sub",
+        "data/sub/deep",
+    ]
+
+
+def test_folder_totals_reject_cycles(archive_path):
+    package = Package(header_path=archive_path)
+    folders = {
+        package.get_folder_path(folder).as_posix(): folder for folder in package.folders
+    }
+
+    # data -> data/sub/deep -> data/sub -> data
+    folders["data"].parent_folder_id = package.folders.index(folders["data/sub/deep"])
+
+    with pytest.raises(ValueError, match="cycle"):
+        package.get_folder_totals()
@@ -0,0 +1,53 @@
+import json
+
+import pytest
+from typer.testing import CliRunner
+
+from northlighttools import app
+from northlighttools.rmdp.package_set import PackageSet
+
+runner = CliRunner()
+
+
+@pytest.fixture
+def game_dir(make_package):
+    make_package("data", {"data/a.txt": b"first", "data/b.txt": b"second"})
+    return make_package("patch", {"data/a.txt": b"patched"}).parent
+
+
+def run_index(game_dir, *args):
+    result = runner.invoke(
+        app, ["rmdp", "index", str(game_dir), "--lookup", "data/a.txt", *args]
+    )
+    assert result.exit_code == 0, result.output
+
+    return result.output
+
+
+@pytest.mark.parametrize(
+    "content",
+    [
+        json.dumps({"version": 0, "archives": [], "entries": []}),
+        '{"version": 1, "archives": ["da',
+        json.dumps({"version": 1, "archives": [], "entries": [["x", 5, 0, 0, 0, 0]]}),
+        json.dumps([1, 2, 3]),
+        "\xff\xfe garbage",
+    ],
+)
+def test_index_rebuilds_outdated_or_corrupted_index(game_dir, content):
+    index_path = game_dir / "rmdp_index.json"
+    index_path.write_text(content, encoding="latin-1")
+
+    output = run_index(game_dir, "--priority", "patch*")
+
+    assert "rebuilding index" in output
+    assert "patch.bin (active)" in output
+    assert PackageSet.load(index_path).lookup("data/a.txt")
+
+
+def test_index_is_reused_when_up_to_date(game_dir):
+    run_index(game_dir)
+    output = run_index(game_dir)
+
+    assert "rebuilding index" not in output
+    assert len(PackageSet.load(game_dir / "rmdp_index.json").lookup("data/a.txt")) == 2
@@ -0,0 +1,57 @@
+import zlib
+
+import pytest
+from typer.testing import CliRunner
+
+from northlighttools import app
+from northlighttools.rmdp.enumerators.manifest_format import ManifestFormat
+from northlighttools.rmdp.manifest import ExtractionManifest
+from northlighttools.rmdp.package import Package
+
+runner = CliRunner()
+
+FILES = {
+    "data/a.txt": b"first",
+    "data/sub/b.bin": bytes(range(256)) * 4,
+    "data/sub/c.txt": "Zażółć gęślą jaźń".encode("utf-8"),
+    "data/empty.txt": b"",
+}
+
+
+@pytest.mark.parametrize("manifest_format", list(ManifestFormat))
+def test_extract_manifest_round_trip(tmp_path, make_package, manifest_format):
+    archive_path = make_package("data", FILES)
+    output_dir = tmp_path / "extracted"
+    manifest_path = tmp_path / f"manifest.{manifest_format.value}"
+
+    result = runner.invoke(
+        app,
+        [
+            "rmdp",
+            "extract",
+            str(archive_path),
+            str(output_dir),
+            "--manifest",
+            str(manifest_path),
+            "--manifest-format",
+            manifest_format.value,
+        ],
+    )
+    assert result.exit_code == 0, result.output
+
+    entries = list(ExtractionManifest.read(manifest_path))
+    package = Package(header_path=archive_path)
+    package_files = {
+        package.get_file_path(file).as_posix(): file for file in package.files
+    }
+
+    assert sorted(entry.path for entry in entries) == sorted(FILES)
+
+    for entry in entries:
+        data = (output_dir / entry.path).read_bytes()
+
+        assert data == FILES[entry.path]
+        assert entry.size == len(data)
+        assert entry.checksum == zlib.crc32(data)
+        assert entry.offset == package_files[entry.path].offset
+        assert entry.write_time == package_files[entry.path].write_time
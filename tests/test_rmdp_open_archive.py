@@ -0,0 +1,54 @@
+import hashlib
+
+import numpy as np
+import pytest
+
+from northlighttools.rmdp.package import Package
+
+FILES = {
+    "data/a.bin": bytes(range(256)),
+    "data/b.txt": b"Hello world",
+    "data/c.txt": b"",
+}
+
+
+@pytest.fixture
+def archive_path(make_package):
+    return make_package("data", FILES)
+
+
+def test_open_archive_yields_all_files(archive_path):
+    with Package.open_archive(archive_path) as files:
+        digests = {
+            path.as_posix(): hashlib.sha1(data).hexdigest() for path, _, data in files
+        }
+
+    assert digests == {
+        path: hashlib.sha1(data).hexdigest() for path, data in FILES.items()
+    }
+
+
+def test_derived_buffers_outlive_context(archive_path):
+    arrays, slices = {}, {}
+
+    with Package.open_archive(archive_path) as files:
+        for path, _, data in files:
+            arrays[path.as_posix()] = np.frombuffer(data, np.uint8)
+            slices[path.as_posix()] = data[1:3]
+
+    assert {path: array.tobytes() for path, array in arrays.items()} == FILES
+    assert {path: bytes(view) for path, view in slices.items()} == {
+        path: data[1:3] for path, data in FILES.items()
+    }
+
+
+def test_exception_in_block_is_not_replaced(archive_path):
+    arrays = []
+
+    with pytest.raises(RuntimeError, match="consumer failed"):
+        with Package.open_archive(archive_path) as files:
+            for _, _, data in files:
+                arrays.append(np.frombuffer(data, np.uint8))
+                raise RuntimeError("consumer failed")
+
+    assert arrays[0].tobytes() in FILES.values()
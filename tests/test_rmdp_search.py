@@ -0,0 +1,34 @@
+import pytest
+from typer.testing import CliRunner
+
+from northlighttools import app
+from northlighttools.rmdp.enumerators.text_encoding import TextEncoding
+from northlighttools.rmdp.search import compile_pattern
+
+runner = CliRunner()
+
+
+@pytest.fixture
+def archive_path(tmp_path):
+    # Empty pair of files is enough, patterns are checked before reading it
+    (tmp_path / "archive.bin").touch()
+    (tmp_path / "archive.rmdp").touch()
+
+    return tmp_path / "archive.bin"
+
+
+@pytest.mark.parametrize(
+    "args", [["a*", "--regex"], ["", "--regex"], ["(x|)", "--regex"], [""]]
+)
+def test_grep_rejects_pattern_matching_empty_text(archive_path, args):
+    result = runner.invoke(app, ["rmdp", "grep", str(archive_path), *args])
+
+    assert result.exit_code == 2
+    assert "must not match empty text" in result.output
+
+
+def test_compile_pattern_matches_all_encodings():
+    pattern = compile_pattern("hi", list(TextEncoding))
+
+    assert pattern.search(b"xxhi") is not None
+    assert pattern.search("xxhi".encode("utf-16le")) is not None
@@ -0,0 +1,59 @@
+import re
+
+import pytest
+
+from northlighttools.string_table.enumerators.data_format import DataFormat
+from northlighttools.string_table.string_table import StringTable
+
+# Header of PO file has the time it was created
+CREATION_DATE = re.compile(rb'"POT-Creation-Date: [^"]*"')
+
+ENTRIES = {
+    "menu_start": "Start game",
+    "quotes": "He said \"hi\" and 'bye'",
+    "markup": "<b>Bold</b> & <i>italic</i> > rest",
+    "line_breaks": "First line\nSecond line\n",
+    "carriage_return": "Old\r\nstyle",
+    "tab": "Column\tcolumn",
+    "escaped": "Literal \\n and \\t and \\\\",
+    "emoji": "Wide 文字 and emoji 😀",
+    "long": "Long line that has to be wrapped by PO writer, " * 4,
+    "long_wide": "行" * 60,
+    "control": "Bell\x07 and null",
+    "unit::segment": "Segment of unit",
+    "unit::segment-1": "Auto segment",
+    'attr "quoted" <&>\t\n': "Key escaping",
+    "empty_value": "",
+    "": "Empty key",
+}
+
+
+@pytest.fixture
+def string_table():
+    table = StringTable()
+    table.entries.update(ENTRIES)
+    return table
+
+
+@pytest.mark.parametrize("data_format", list(DataFormat))
+def test_export_matches_translate_toolkit(tmp_path, string_table, data_format):
+    output_path = tmp_path / f"strings.{data_format.value}"
+    toolkit_path = tmp_path / f"toolkit.{data_format.value}"
+
+    string_table.export(output_path, data_format)
+    string_table.export(toolkit_path, data_format, use_translate_toolkit=True)
+
+    assert CREATION_DATE.sub(b"", output_path.read_bytes()) == CREATION_DATE.sub(
+        b"", toolkit_path.read_bytes()
+    )
+
+
+def test_xliff_escapes_id_separator(tmp_path):
+    # Unlike translate-toolkit, separator in key doesn't start a new file
+    table = StringTable()
+    table.entries["first\x04second"] = "Separator in key"
+    output_path = tmp_path / "strings.xliff"
+
+    table.export(output_path, DataFormat.XLIFF)
+
+    assert 'id="first__%04__second"' in output_path.read_text(encoding="utf-8")